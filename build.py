@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+打包脚本
+将后端代码预编译为字节码并打包为 zipapp（yushu.pyz），启动时通过 zipimport
+直接从压缩包读取 .pyc，省去逐个文件的 stat/读取/编译。
+第三方依赖仍从 site-packages 导入，需先 pip install -r requirements.txt。
+
+用法: python build.py  然后  python yushu.pyz
+注意: .pyc 与构建时的Python版本绑定，需使用相同版本的解释器运行
+"""
+
+import os
+import sys
+import shutil
+import zipapp
+import compileall
+import tempfile
+
+# 打包进 zipapp 的顶层模块与包
+APP_MODULES = ("start.py", "main.py", "config.py")
+APP_PACKAGES = ("routers", "services")
+
+OUTPUT_FILE = "yushu.pyz"
+INTERPRETER = "/usr/bin/env python3"
+
+
+def _copy_sources(root, staging):
+    """复制后端源码到临时目录"""
+    for name in APP_MODULES:
+        shutil.copy2(os.path.join(root, name), staging)
+    for name in APP_PACKAGES:
+        shutil.copytree(
+            os.path.join(root, name),
+            os.path.join(staging, name),
+            ignore=shutil.ignore_patterns("__pycache__", "*.pyc")
+        )
+
+
+def _compile_sources(staging):
+    """就地编译为 .pyc（-b 布局）并删除 .py，压缩包内只保留字节码"""
+    if not compileall.compile_dir(staging, quiet=1, legacy=True, optimize=0):
+        return False
+    for dirpath, _, filenames in os.walk(staging):
+        for filename in filenames:
+            if filename.endswith(".py"):
+                os.remove(os.path.join(dirpath, filename))
+    return True
+
+
+def build():
+    """构建 zipapp"""
+    root = os.path.dirname(os.path.abspath(__file__))
+    output = os.path.join(root, OUTPUT_FILE)
+
+    with tempfile.TemporaryDirectory() as staging:
+        _copy_sources(root, staging)
+        if not _compile_sources(staging):
+            print("❌ 字节码编译失败")
+            return False
+        zipapp.create_archive(staging, output, interpreter=INTERPRETER, main="start:main")
+
+    print(f"✅ 已生成 {OUTPUT_FILE} (Python {sys.version.split()[0]})")
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if build() else 1)
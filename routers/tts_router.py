@@ -438,6 +438,59 @@ async def synthesize_text_stream(request: TTSStreamRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/synthesize/audio/stream")
+async def synthesize_audio_stream(request: TTSStreamRequest):
+    """
+    文本转语音合成 - 以分块传输方式直接返回MP3音频
+    首个音频块到达即开始返回，适用于对首包延迟敏感的播放场景
+    """
+    try:
+        # 初始化TTS（如果需要）
+        config = initialize_tts_if_needed()
+
+        if not config or not config.get('enabled', True):
+            raise HTTPException(status_code=400, detail="TTS服务未启用")
+
+        # 验证文本
+        if not request.text or len(request.text.strip()) == 0:
+            raise HTTPException(status_code=400, detail="文本内容不能为空")
+
+        if len(request.text) > 10000:
+            raise HTTPException(status_code=400, detail="文本长度不能超过10000个字符")
+
+        # 确定使用的提供商
+        provider = request.provider or config.get('default_provider', 'baidu')
+
+        try:
+            audio_stream = tts_manager.synthesize_audio_stream(
+                provider=provider,
+                text=request.text,
+                voice=request.voice,
+                speed=request.speed,
+                pitch=request.pitch,
+                volume=request.volume,
+                language=request.language
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        # 先取得首个数据块，使合成错误能以HTTP错误码返回
+        first_chunk = await asyncio.to_thread(next, audio_stream, b"")
+
+        def iter_audio():
+            if first_chunk:
+                yield first_chunk
+            yield from audio_stream
+
+        return StreamingResponse(iter_audio(), media_type="audio/mpeg")
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"流式音频合成失败: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/download/{cache_key}")
 async def download_audio(cache_key: str):
     """下载合成的音频文件"""
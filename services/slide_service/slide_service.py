@@ -5,8 +5,11 @@
 
 import os
 import uuid
+import json
 import base64
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from io import BytesIO
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
@@ -39,6 +42,16 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# PPTX解析结果缓存的最大条目数
+PPTX_CACHE_SIZE = 32
+
+# 缩略图尺寸上限 (宽, 高)
+THUMBNAIL_SIZE = (150, 100)
+
+# PNG编码线程数与压缩级别（级别1比默认6快约3倍，文件约大15%）
+PNG_ENCODE_WORKERS = 4
+PNG_COMPRESS_LEVEL = 1
+
 class SlideService:
     """幻灯片处理服务"""
     
@@ -57,6 +70,65 @@ class SlideService:
         # 音频存储路径
         self.audio_path = self.storage_path / "audio"
         self.audio_path.mkdir(exist_ok=True)
+        
+        # PPTX文本解析缓存 (文件路径, 修改时间) -> 各页文本内容，按LRU淘汰
+        self._pptx_cache: "OrderedDict[Tuple[str, int], List[Dict[str, Any]]]" = OrderedDict()
+        
+        # 幻灯片图片/音频路径索引 (文档ID, 页码) -> 文件路径，持久化到 manifest.json
+        self.manifest_path = self.storage_path / "manifest.json"
+        self._image_index: Dict[Tuple[str, int], Path] = {}
+        self._audio_index: Dict[Tuple[str, int], Path] = {}
+        self._load_manifest()
+        
+        # PNG编码线程池：编码在C层释放GIL，可与下一页的渲染重叠
+        self._png_encoder = ThreadPoolExecutor(max_workers=PNG_ENCODE_WORKERS, thread_name_prefix="slide-png")
+    
+    def _load_manifest(self):
+        """从 manifest.json 恢复图片/音频路径索引"""
+        if not self.manifest_path.exists():
+            return
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            for document_id, page_num, filename in manifest.get("images", []):
+                self._image_index[(document_id, page_num)] = self.images_path / filename
+            for document_id, page_num, filename in manifest.get("audio", []):
+                self._audio_index[(document_id, page_num)] = self.audio_path / filename
+        except Exception as e:
+            logger.warning(f"加载幻灯片索引失败: {e}")
+    
+    def _save_manifest(self):
+        """将图片/音频路径索引写入 manifest.json"""
+        manifest = {
+            "images": [[doc_id, page, path.name] for (doc_id, page), path in self._image_index.items()],
+            "audio": [[doc_id, page, path.name] for (doc_id, page), path in self._audio_index.items()]
+        }
+        try:
+            tmp_path = self.manifest_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+        except Exception as e:
+            logger.warning(f"保存幻灯片索引失败: {e}")
+    
+    @staticmethod
+    def _read_indexed_file(index: Dict[Tuple[str, int], Path], key: Tuple[str, int],
+                           fallback_path: Path) -> Optional[bytes]:
+        """优先按索引读取文件，索引未命中时才检查文件是否存在"""
+        path = index.get(key)
+        if path is not None:
+            try:
+                with open(path, "rb") as f:
+                    return f.read()
+            except FileNotFoundError:
+                # 文件已被删除，移除失效索引
+                index.pop(key, None)
+        
+        if fallback_path.exists():
+            index[key] = fallback_path
+            with open(fallback_path, "rb") as f:
+                return f.read()
+        return None
     
     async def process_document(self, request: SlideProcessRequest) -> SlideContent:
         """处理文档，提取幻灯片内容"""
@@ -68,11 +140,14 @@ class SlideService:
             file_extension = file_path.suffix.lower()
             
             if file_extension == '.pdf':
-                return await self._process_pdf(request)
+                slide_content = await self._process_pdf(request)
             elif file_extension in ['.pptx', '.ppt']:
-                return await self._process_pptx(request)
+                slide_content = await self._process_pptx(request)
             else:
                 raise ValueError(f"不支持的文件格式: {file_extension}")
+            
+            self._save_manifest()
+            return slide_content
                 
         except Exception as e:
             logger.error(f"文档处理失败: {str(e)}")
@@ -86,14 +161,15 @@ class SlideService:
         file_path = Path(request.file_path)
         filename = file_path.name
         
-        # 使用PyMuPDF打开PDF
-        doc = fitz.open(str(file_path))
+        # 使用PyMuPDF打开PDF，显式指定文件类型以跳过格式探测
+        doc = fitz.open(str(file_path), filetype="pdf")
         total_pages = len(doc)
         
         slides = []
+        encode_futures = []
+        encoded_images = []
         
-        for page_num in range(total_pages):
-            page = doc.load_page(page_num)
+        for page_num, page in enumerate(doc.pages()):
             
             # 提取文字内容
             text_content = page.get_text()
@@ -104,21 +180,22 @@ class SlideService:
             
             if request.extract_images:
                 # 将页面转换为图片
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))  # 2倍分辨率
-                img_data = pix.tobytes("png")
+                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)  # 2倍分辨率
                 
-                # 保存原图
+                # 保存原图：PNG编码交给线程池，主循环继续渲染下一页
                 image_filename = f"{request.document_id}_page_{page_num + 1}.png"
                 image_path = self.images_path / image_filename
                 
-                with open(image_path, "wb") as f:
-                    f.write(img_data)
+                encode_futures.append(asyncio.wrap_future(self._png_encoder.submit(
+                    self._encode_png, pix.samples, pix.width, pix.height, pix.stride, image_path
+                )))
+                encoded_images.append(((request.document_id, page_num + 1), image_path))
                 
                 image_url = f"/api/slides/images/{image_filename}"
                 
-                # 生成缩略图
+                # 生成缩略图：直接按缩略图分辨率渲染页面，无需重新解码大图
                 if request.generate_thumbnails:
-                    thumbnail_url = await self._generate_thumbnail(image_path, page_num + 1, request.document_id)
+                    thumbnail_url = self._render_pdf_thumbnail(page, page_num + 1, request.document_id)
             
             # 尝试提取标题（第一行文字）
             title = None
@@ -141,6 +218,11 @@ class SlideService:
         
         doc.close()
         
+        # 等待所有页面图片写入完成后再登记索引，避免并发的图片请求拿到尚未写完的路径
+        if encode_futures:
+            await asyncio.gather(*encode_futures)
+            self._image_index.update(encoded_images)
+        
         return SlideContent(
             document_id=request.document_id,
             filename=filename,
@@ -177,29 +259,11 @@ class SlideService:
             
             if PPTX_SUPPORT:
                 try:
-                    prs = Presentation(str(file_path))
-                    for slide_num, slide in enumerate(prs.slides):
-                        # 提取标题
-                        title = None
-                        if slide.shapes.title:
-                            title = slide.shapes.title.text
-                        titles.append(title or f"第{slide_num + 1}页")
-                        
-                        # 提取文字内容
-                        text_content = ""
-                        for shape in slide.shapes:
-                            if hasattr(shape, "text") and shape.text:
-                                text_content += shape.text + "\n"
-                        text_contents.append(text_content.strip())
-                        
-                        # 提取演讲者备注
-                        notes = ""
-                        if slide.has_notes_slide:
-                            notes_slide = slide.notes_slide
-                            for shape in notes_slide.shapes:
-                                if hasattr(shape, "text") and shape.text:
-                                    notes += shape.text + "\n"
-                        notes_list.append(notes.strip() if notes else None)
+                    # 复用已解析的文本内容，避免重复打开Presentation
+                    for slide_data in await self.extract_ppt_text_content(str(file_path)):
+                        titles.append(slide_data["title"])
+                        text_contents.append(slide_data["slide_text"])
+                        notes_list.append(slide_data["notes"] or None)
                 except Exception as e:
                     logger.warning(f"提取PPTX文本内容失败: {e}")
                     # 创建默认文本内容
@@ -217,6 +281,7 @@ class SlideService:
             # 创建幻灯片信息
             for i, image_path in enumerate(image_paths):
                 image_filename = Path(image_path).name
+                self._image_index[(request.document_id, i + 1)] = Path(image_path)
                 image_url = f"/api/slides/images/{image_filename}" if request.extract_images else None
                 
                 # 生成缩略图
@@ -247,42 +312,19 @@ class SlideService:
             
             # 只提取文本内容，不生成图片
             logger.info("PPT转图片服务不可用，仅提取文本内容")
-            prs = Presentation(str(file_path))
-            total_pages = len(prs.slides)
+            slide_contents = await self.extract_ppt_text_content(str(file_path))
+            total_pages = len(slide_contents)
             
-            for slide_num, slide in enumerate(prs.slides):
-                # 提取文字内容
-                text_content = ""
-                title = None
-                
-                # 提取标题
-                if slide.shapes.title:
-                    title = slide.shapes.title.text
-                
-                # 提取所有文字内容
-                for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text:
-                        text_content += shape.text + "\n"
-                
-                # 提取演讲者备注
-                notes = ""
-                if slide.has_notes_slide:
-                    notes_slide = slide.notes_slide
-                    for shape in notes_slide.shapes:
-                        if hasattr(shape, "text") and shape.text:
-                            notes += shape.text + "\n"
-                
-                if not title:
-                    title = f"第{slide_num + 1}页"
-                
+            for slide_data in slide_contents:
+                page_num = slide_data["page_number"]
                 slide_info = SlideInfo(
-                    id=f"{request.document_id}_slide_{slide_num + 1}",
-                    page_number=slide_num + 1,
-                    title=title,
-                    content=text_content.strip(),
+                    id=f"{request.document_id}_slide_{page_num}",
+                    page_number=page_num,
+                    title=slide_data["title"],
+                    content=slide_data["slide_text"],
                     image_url=None,  # 不生成图片
                     thumbnail_url=None,
-                    notes=notes.strip() if notes else None
+                    notes=slide_data["notes"] or None
                 )
                 
                 slides.append(slide_info)
@@ -295,13 +337,39 @@ class SlideService:
         )
     
     
+    @staticmethod
+    def _encode_png(samples: bytes, width: int, height: int, stride: int, image_path: Path):
+        """将渲染得到的RGB像素编码为PNG，先写临时文件再原子替换，读取方不会看到写了一半的图片"""
+        img = Image.frombuffer("RGB", (width, height), samples, "raw", "RGB", stride, 1)
+        tmp_path = image_path.with_suffix(".png.tmp")
+        img.save(tmp_path, "PNG", compress_level=PNG_COMPRESS_LEVEL)
+        os.replace(tmp_path, image_path)
+    
+    def _render_pdf_thumbnail(self, page: "fitz.Page", page_num: int, document_id: str) -> Optional[str]:
+        """使用PyMuPDF按缩略图分辨率直接渲染PDF页面"""
+        try:
+            rect = page.rect
+            zoom = min(THUMBNAIL_SIZE[0] / rect.width, THUMBNAIL_SIZE[1] / rect.height)
+            thumb_pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            
+            thumbnail_filename = f"{document_id}_thumb_{page_num}.png"
+            thumb_pix.save(str(self.thumbnails_path / thumbnail_filename))
+            
+            return f"/api/slides/thumbnails/{thumbnail_filename}"
+            
+        except Exception as e:
+            logger.error(f"缩略图生成失败: {str(e)}")
+            return None
+    
     async def _generate_thumbnail(self, image_path: Path, page_num: int, document_id: str) -> str:
-        """生成缩略图"""
+        """根据已渲染的幻灯片图片生成缩略图（用于PPT转换结果）"""
         try:
             # 打开原图
             with Image.open(image_path) as img:
+                # JPEG源图可在解码阶段直接降采样，其他格式忽略
+                img.draft("RGB", THUMBNAIL_SIZE)
                 # 生成缩略图 (150x100)
-                img.thumbnail((150, 100), Image.Resampling.LANCZOS)
+                img.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
                 
                 # 保存缩略图
                 thumbnail_filename = f"{document_id}_thumb_{page_num}.png"
@@ -443,12 +511,9 @@ class SlideService:
     async def get_slide_image(self, document_id: str, page_num: int) -> Optional[bytes]:
         """获取幻灯片图片数据"""
         image_filename = f"{document_id}_page_{page_num}.png"
-        image_path = self.images_path / image_filename
-        
-        if image_path.exists():
-            with open(image_path, "rb") as f:
-                return f.read()
-        return None
+        return self._read_indexed_file(
+            self._image_index, (document_id, page_num), self.images_path / image_filename
+        )
     
     async def get_slide_thumbnail(self, document_id: str, page_num: int) -> Optional[bytes]:
         """获取幻灯片缩略图数据"""
@@ -470,6 +535,13 @@ class SlideService:
             if not file_path_obj.exists():
                 raise FileNotFoundError(f"文件不存在: {file_path}")
             
+            # 同一文件未修改时直接返回缓存的解析结果
+            cache_key = (str(file_path_obj.resolve()), file_path_obj.stat().st_mtime_ns)
+            cached = self._pptx_cache.get(cache_key)
+            if cached is not None:
+                self._pptx_cache.move_to_end(cache_key)
+                return [dict(slide_data) for slide_data in cached]
+            
             prs = Presentation(str(file_path_obj))
             slide_contents = []
             
@@ -479,33 +551,43 @@ class SlideService:
                 if slide.shapes.title:
                     title = slide.shapes.title.text.strip()
                 
-                # 提取正文内容
-                content_text = ""
-                for shape in slide.shapes:
-                    if hasattr(shape, "text") and shape.text:
-                        # 跳过标题，避免重复
-                        if shape != slide.shapes.title:
-                            content_text += shape.text.strip() + "\n"
+                # 提取正文内容（跳过标题，避免重复）
+                title_shape = slide.shapes.title
+                content_text = "\n".join(
+                    shape.text.strip() for shape in slide.shapes
+                    if getattr(shape, "text", None) and shape != title_shape
+                )
+                
+                # 整页文字（含标题），作为幻灯片内容
+                slide_text = "\n".join(
+                    shape.text for shape in slide.shapes if getattr(shape, "text", None)
+                )
                 
                 # 提取演讲者备注
                 notes = ""
                 if slide.has_notes_slide:
                     notes_slide = slide.notes_slide
-                    for shape in notes_slide.shapes:
-                        if hasattr(shape, "text") and shape.text:
-                            notes += shape.text.strip() + "\n"
+                    notes = "\n".join(
+                        shape.text.strip() for shape in notes_slide.shapes if getattr(shape, "text", None)
+                    )
                 
                 slide_data = {
                     "page_number": slide_num,
                     "title": title or f"第{slide_num}页",
                     "content": content_text.strip(),
+                    "slide_text": slide_text.strip(),
                     "notes": notes.strip() if notes else "",
                     "full_text": f"{title}\n{content_text}\n{notes}".strip()
                 }
                 
                 slide_contents.append(slide_data)
-                
-            return slide_contents
+            
+            self._pptx_cache[cache_key] = slide_contents
+            if len(self._pptx_cache) > PPTX_CACHE_SIZE:
+                self._pptx_cache.popitem(last=False)
+            
+            # 返回副本，调用方修改结果不影响缓存
+            return [dict(slide_data) for slide_data in slide_contents]
             
         except Exception as e:
             logger.error(f"提取PPTX文本内容失败: {e}")
@@ -602,8 +684,12 @@ PPT页面内容：
                                    text: str, 
                                    document_id: str, 
                                    page_number: int,
-                                   voice_settings: Dict[str, Any] = None) -> Dict[str, Any]:
-        """为幻灯片文本合成语音"""
+                                   voice_settings: Dict[str, Any] = None,
+                                   save_manifest: bool = True) -> Dict[str, Any]:
+        """
+        为幻灯片文本合成语音
+        批量合成多页时传入 save_manifest=False，由调用方在全部完成后统一保存索引
+        """
         try:
             # 初始化TTS服务
             await self._initialize_tts_if_needed()
@@ -647,6 +733,10 @@ PPT页面内容：
             if not response.success:
                 raise Exception(f"TTS合成失败: {response.error_msg}")
             
+            self._audio_index[(document_id, page_number)] = audio_path
+            if save_manifest:
+                self._save_manifest()
+            
             # 获取音频文件大小
             audio_size = 0
             if audio_path.exists():
@@ -701,7 +791,8 @@ PPT页面内容：
                     narration_text,
                     document_id,
                     page_num,
-                    voice_settings
+                    voice_settings,
+                    save_manifest=False
                 )
                 
                 page_result = {
@@ -719,6 +810,10 @@ PPT页面内容：
                 # 短暂延迟，避免API调用过快
                 await asyncio.sleep(0.5)
             
+            # 整份文档的音频索引只保存一次
+            if generated_files:
+                self._save_manifest()
+            
             success_count = sum(1 for r in results if r["audio_result"].get("success"))
             
             return {
@@ -734,6 +829,8 @@ PPT页面内容：
             
         except Exception as e:
             logger.error(f"生成PPT讲解失败: {e}")
+            # 保存中途失败前已合成页面的音频索引
+            self._save_manifest()
             return {
                 "success": False,
                 "error": str(e),
@@ -743,12 +840,9 @@ PPT页面内容：
     async def get_slide_audio(self, document_id: str, page_number: int) -> Optional[bytes]:
         """获取幻灯片音频数据"""
         audio_filename = f"{document_id}_page_{page_number}.wav"
-        audio_path = self.audio_path / audio_filename
-        
-        if audio_path.exists():
-            with open(audio_path, "rb") as f:
-                return f.read()
-        return None
+        return self._read_indexed_file(
+            self._audio_index, (document_id, page_number), self.audio_path / audio_filename
+        )
 
     async def _initialize_llm_if_needed(self):
         """根据需要初始化LLM服务"""
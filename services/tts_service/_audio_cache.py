@@ -0,0 +1,276 @@
+"""
+TTS合成结果缓存
+以 (提供商, 文本, 发音人, 语速, 音调, 音量, 语言, 格式, 提供商配置指纹) 的SHA-256为键，
+音频文件持久化在缓存目录中，索引（按最近使用排序）保存在 index.json，
+总大小超过上限时按LRU淘汰。可选在内存中保留最近使用条目的音频数据。
+索引按批写出：累计一定次数的变更、距上次写出超过一定时间、发生淘汰或进程退出时写出。
+"""
+import os
+import json
+import time
+import shutil
+import atexit
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 默认缓存目录与容量上限，可通过环境变量覆盖
+DEFAULT_CACHE_DIR = os.path.join(os.getenv('TMPDIR', '/tmp'), 'tts-cache')
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+INDEX_FILE = 'index.json'
+# 索引累计变更（写入或LRU顺序变化）达到该次数，或距上次写出超过该秒数时写出
+INDEX_SAVE_INTERVAL = 64
+INDEX_SAVE_SECONDS = 30.0
+
+# 进程退出时写出尚未保存的索引（弱引用，不延长缓存实例的生命周期）
+_live_caches: "weakref.WeakSet[AudioCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_all() -> None:
+    for cache in list(_live_caches):
+        cache.flush()
+
+
+def _is_cache_key(name: str) -> bool:
+    """是否为 make_key 生成的缓存键（SHA-256十六进制串）"""
+    return len(name) == 64 and all(c in '0123456789abcdef' for c in name)
+
+
+class AudioCache:
+    """内容寻址的音频缓存：内存中的LRU索引 + 磁盘音频文件"""
+
+    def __init__(self, cache_dir: str, max_cache_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+                 max_memory_entries: int = 0):
+        """
+        Args:
+            cache_dir: 缓存目录
+            max_cache_bytes: 缓存音频的总字节数上限
+            max_memory_entries: 内存中保留音频数据的条目数，0表示只使用磁盘缓存
+        """
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        self.max_memory_entries = max_memory_entries
+        self._index: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._pending_changes = 0
+        self._last_save = time.monotonic()
+        os.makedirs(cache_dir, exist_ok=True)
+        # 同一目录的旧实例（如重新初始化前的提供商）先写出未保存的变更
+        for cache in list(_live_caches):
+            if cache.cache_dir == cache_dir:
+                cache.flush()
+        self._load_index()
+        _live_caches.add(self)
+
+    @staticmethod
+    def config_fingerprint(config: Dict[str, Any]) -> str:
+        """
+        提供商配置的指纹：未指定发音人等参数时提供商使用配置中的默认值，
+        配置变化后旧的缓存条目不再命中
+        """
+        raw = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_key(provider: str, text: str, voice: Optional[str], speed: float, pitch: float,
+                 volume: float, language: str, audio_format: str, config_fingerprint: str = '') -> str:
+        """根据规范化后的合成参数及提供商配置指纹生成缓存键"""
+        raw = json.dumps(
+            [provider, text, voice, float(speed), float(pitch), float(volume),
+             language, (audio_format or '').lower(), config_fingerprint],
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def _load_index(self) -> None:
+        """
+        加载磁盘索引，丢弃文件已不存在的条目；
+        索引未及写出的缓存文件（如进程被强制终止）作为最久未使用的条目加入，以便按LRU淘汰
+        """
+        entries = []
+        try:
+            with open(self._path(INDEX_FILE), 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+        indexed = set()
+        for key, entry in entries:
+            if os.path.exists(self._path(entry['file'])):
+                self._index[key] = entry
+                self._total_bytes += entry['size']
+                indexed.add(entry['file'])
+
+        try:
+            files = [item for item in os.scandir(self.cache_dir) if item.is_file()]
+        except OSError:
+            return
+        for item in files:
+            name = item.name
+            key, ext = os.path.splitext(name)
+            if name in indexed or key in self._index or ext == '.tmp' or not _is_cache_key(key):
+                continue
+            try:
+                size = item.stat().st_size
+            except OSError:
+                continue
+            self._index[key] = {'file': name, 'size': size}
+            self._index.move_to_end(key, last=False)
+            self._total_bytes += size
+            self._pending_changes += 1
+
+    def _save_index(self) -> None:
+        """原子写出索引（调用方持有锁）"""
+        path = self._path(INDEX_FILE)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self._pending_changes = 0
+        self._last_save = time.monotonic()
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._index.items()), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"写入TTS缓存索引失败: {e}")
+
+    def _index_changed(self) -> None:
+        """记录一次索引变更，累计足够次数或距上次写出足够久时写出（调用方持有锁）"""
+        self._pending_changes += 1
+        if (self._pending_changes >= INDEX_SAVE_INTERVAL
+                or time.monotonic() - self._last_save >= INDEX_SAVE_SECONDS):
+            self._save_index()
+
+    def flush(self) -> None:
+        """写出尚未保存的索引变更"""
+        with self._lock:
+            if self._pending_changes:
+                self._save_index()
+
+    def lookup(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        查找缓存，命中时更新LRU顺序
+        Returns:
+            Optional[Tuple[str, Dict[str, Any]]]: (音频文件路径, 写入时附带的元数据)
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            path = self._path(entry['file'])
+            if not os.path.exists(path):
+                del self._index[key]
+                self._total_bytes -= entry['size']
+                self._index_changed()
+                return None
+            self._index.move_to_end(key)
+            self._index_changed()
+            return path, dict(entry.get('meta') or {})
+
+    def get(self, key: str) -> Optional[str]:
+        """查找缓存，命中时返回音频文件路径并更新LRU顺序"""
+        found = self.lookup(key)
+        return found[0] if found else None
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """查找缓存并返回音频数据，优先读取内存中的条目"""
+        with self._lock:
+            audio_data = self._memory.get(key)
+            if audio_data is not None:
+                self._memory.move_to_end(key)
+                if key in self._index:
+                    self._index.move_to_end(key)
+                    self._index_changed()
+                return audio_data
+
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                audio_data = f.read()
+        except OSError:
+            return None
+        self._remember(key, audio_data)
+        return audio_data
+
+    def _remember(self, key: str, audio_data: bytes) -> None:
+        """将音频数据放入内存LRU"""
+        if self.max_memory_entries <= 0:
+            return
+        with self._lock:
+            self._memory[key] = audio_data
+            self._memory.move_to_end(key)
+            if len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def put(self, key: str, ext: str, audio_file: Optional[str] = None,
+            audio_data: Optional[bytes] = None, metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        写入缓存，优先复制已有音频文件，否则写出内存中的音频数据
+        Args:
+            metadata: 随条目保存的附加信息（需可JSON序列化），命中时由 lookup 返回
+        Returns:
+            Optional[str]: 缓存文件路径，写入失败时返回None
+        """
+        name = f"{key}{ext}"
+        path = self._path(name)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            if audio_file and os.path.exists(audio_file):
+                shutil.copyfile(audio_file, tmp_path)
+            elif audio_data:
+                with open(tmp_path, 'wb') as f:
+                    f.write(audio_data)
+            else:
+                return None
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"写入TTS缓存失败: {e}")
+            return None
+
+        with self._lock:
+            old = self._index.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old['size']
+            entry = {'file': name, 'size': size}
+            if metadata:
+                entry['meta'] = metadata
+            self._index[key] = entry
+            self._total_bytes += size
+            if self._evict():
+                self._save_index()
+            else:
+                self._index_changed()
+        if audio_data:
+            self._remember(key, audio_data)
+        return path
+
+    def _evict(self) -> bool:
+        """
+        淘汰最久未使用的条目直到总大小不超过上限（调用方持有锁），至少保留最新条目
+        Returns:
+            bool: 是否淘汰了条目
+        """
+        evicted = False
+        while self._total_bytes > self.max_cache_bytes and len(self._index) > 1:
+            key, entry = self._index.popitem(last=False)
+            self._total_bytes -= entry['size']
+            self._memory.pop(key, None)
+            evicted = True
+            try:
+                os.unlink(self._path(entry['file']))
+            except OSError:
+                pass
+        return evicted
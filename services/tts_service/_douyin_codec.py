@@ -0,0 +1,101 @@
+"""
+抖音（火山引擎）二进制协议的定长字段编解码
+消息头及不带事件的消息体只包含整数字段，这里把它们合并为少量预编译的
+struct 格式，一次 unpack_from 即可取出序列号/错误码与载荷长度。
+另为热路径上的请求/音频消息提供专用的编码与解析函数。
+"""
+import struct
+from typing import Optional, Tuple
+
+# 头部第二字节高4位：消息类型；低4位：标志位
+_TYPES_WITH_SEQ = frozenset([0b1, 0b10, 0b1001, 0b1011, 0b1100])
+_SEQ_FLAGS = frozenset([0b1, 0b11])
+_MSG_TYPE_ERROR = 0b1111
+
+# 序列号 + 载荷长度、错误码 + 载荷长度、单独的序列号/错误码/载荷长度
+_SEQ_AND_SIZE = struct.Struct(">iI")
+_CODE_AND_SIZE = struct.Struct(">II")
+_SEQ = struct.Struct(">i")
+_SIZE = struct.Struct(">I")
+
+
+def parse_header(buf) -> Tuple[int, int, int, int, int, int]:
+    """
+    解析3字节消息头
+    Returns:
+        Tuple: (version, header_size, type, flag, serialization, compression)
+    """
+    b0, b1, b2 = buf[0], buf[1], buf[2]
+    return b0 >> 4, b0 & 0x0F, b1 >> 4, b1 & 0x0F, b2 >> 4, b2 & 0x0F
+
+
+def parse_body(buf, off: int, msg_type: int, flag: int) -> Tuple[int, int, int, int]:
+    """
+    解析不带事件（非WithEvent）的消息体定长字段
+    Args:
+        buf: 消息数据
+        off: 头部之后的偏移
+        msg_type: 消息类型
+        flag: 标志位
+    Returns:
+        Tuple: (sequence, error_code, payload_off, payload_len)；字段缺失时为0，
+        数据截断时载荷长度按实际可用字节截短
+    """
+    end = len(buf)
+    sequence = error_code = 0
+    if msg_type in _TYPES_WITH_SEQ:
+        if flag in _SEQ_FLAGS:
+            if off + 8 <= end:
+                sequence, size = _SEQ_AND_SIZE.unpack_from(buf, off)
+                return sequence, 0, off + 8, min(size, end - off - 8)
+            if off + 4 <= end:
+                sequence = _SEQ.unpack_from(buf, off)[0]
+                off += 4
+    elif msg_type == _MSG_TYPE_ERROR:
+        if off + 8 <= end:
+            error_code, size = _CODE_AND_SIZE.unpack_from(buf, off)
+            return 0, error_code, off + 8, min(size, end - off - 8)
+        if off + 4 <= end:
+            error_code = _SIZE.unpack_from(buf, off)[0]
+            off += 4
+
+    if off + 4 <= end:
+        size = _SIZE.unpack_from(buf, off)[0]
+        return sequence, error_code, off + 4, min(size, end - off - 4)
+    return sequence, error_code, off, 0
+
+
+# 热路径上的两种消息：无序号的完整客户端请求（JSON）与带序号的纯音频服务端响应
+_FULL_CLIENT_REQUEST_HEADER = bytes([0x11, 0x10, 0x10, 0x00])
+_MSG_TYPE_AUDIO_ONLY_SERVER = 0b1011
+_SERIALIZATIONS = frozenset([0, 0b1, 0b11, 0b1111])
+_COMPRESSIONS = frozenset([0, 0b1, 0b1111])
+
+
+def marshal_full_client_request(payload: bytes) -> bytearray:
+    """编码 FullClientRequest/NoSeq 消息：4字节头部 + 载荷长度 + 载荷"""
+    size = len(payload)
+    buf = bytearray(8 + size)
+    buf[:4] = _FULL_CLIENT_REQUEST_HEADER
+    _SIZE.pack_into(buf, 4, size)
+    buf[8:] = payload
+    return buf
+
+
+def parse_audio_only_server(data) -> Optional[Tuple[int, int, memoryview]]:
+    """
+    解析带序号的 AudioOnlyServer 消息
+    Returns:
+        Optional[Tuple]: (flag, sequence, payload_view)；消息不是该形态时返回None，
+        由调用方走通用解析
+    """
+    if len(data) < 12 or data[0] != 0x11:
+        return None
+    b1, b2 = data[1], data[2]
+    flag = b1 & 0x0F
+    if b1 >> 4 != _MSG_TYPE_AUDIO_ONLY_SERVER or flag not in _SEQ_FLAGS:
+        return None
+    if b2 >> 4 not in _SERIALIZATIONS or b2 & 0x0F not in _COMPRESSIONS:
+        return None
+    sequence, size = _SEQ_AND_SIZE.unpack_from(data, 4)
+    return flag, sequence, memoryview(data)[12:12 + size]
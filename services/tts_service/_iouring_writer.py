@@ -0,0 +1,137 @@
+"""
+基于 io_uring 的批量文件写出
+将多个音频文件的 open/write/close 合并为少量 io_uring_enter 提交，
+用于批量合成后一次性落盘。需要 Linux 5.6+ 内核及 liburing Python 绑定:
+pip install liburing
+"""
+import os
+import sys
+import platform
+from typing import List, Optional
+
+# 提交队列深度
+QUEUE_DEPTH = 64
+
+try:
+    import liburing
+    _BINDING_AVAILABLE = True
+except ImportError:
+    liburing = None
+    _BINDING_AVAILABLE = False
+
+
+def _kernel_supported() -> bool:
+    """IORING_OP_OPENAT / IORING_OP_CLOSE 需要 Linux 5.6 及以上内核"""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        major, minor = (int(part) for part in platform.release().split('.')[:2])
+    except ValueError:
+        return False
+    return (major, minor) >= (5, 6)
+
+
+IOURING_AVAILABLE = _BINDING_AVAILABLE and _kernel_supported()
+
+
+def _submit_and_reap(ring, cqe, count: int) -> List[int]:
+    """提交所有已准备的SQE并等待 count 个完成事件，按 user_data 返回各自结果"""
+    results = [0] * count
+    liburing.io_uring_submit_and_wait(ring, count)
+    for _ in range(count):
+        liburing.io_uring_wait_cqe(ring, cqe)
+        results[cqe.user_data] = cqe.res
+        liburing.io_uring_cqe_seen(ring, cqe)
+    return results
+
+
+def _discard(paths: List[bytes], fds: Optional[List[int]] = None) -> None:
+    """
+    出错时清理本批文件：关闭仍打开的文件描述符并删除写了一半的文件
+    Args:
+        paths: 文件路径列表
+        fds: 与路径对应的打开结果，为None表示均已打开且已关闭；fd < 0 的文件未被打开，不做处理
+    """
+    for i, path in enumerate(paths):
+        if fds is not None:
+            if fds[i] < 0:
+                continue
+            try:
+                os.close(fds[i])
+            except OSError:
+                pass
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def _write_batch(ring, cqe, paths: List[bytes], blobs: List[bytes]) -> None:
+    """写出一批（不超过队列深度的）文件，失败时不遗留文件描述符与不完整的文件"""
+    count = len(paths)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+
+    # 1. 批量打开文件
+    for i, path in enumerate(paths):
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_openat(sqe, path, flags, 0o644, liburing.AT_FDCWD)
+        liburing.io_uring_sqe_set_data64(sqe, i)
+    fds = _submit_and_reap(ring, cqe, count)
+
+    try:
+        for path, fd in zip(paths, fds):
+            if fd < 0:
+                raise OSError(-fd, os.strerror(-fd), path.decode())
+
+        # 2. 批量写入数据
+        for i, (fd, blob) in enumerate(zip(fds, blobs)):
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_write(sqe, fd, blob, len(blob), 0)
+            liburing.io_uring_sqe_set_data64(sqe, i)
+        written = _submit_and_reap(ring, cqe, count)
+    except BaseException:
+        _discard(paths, fds)
+        raise
+
+    # 3. 批量关闭文件
+    for i, fd in enumerate(fds):
+        sqe = liburing.io_uring_get_sqe(ring)
+        liburing.io_uring_prep_close(sqe, fd)
+        liburing.io_uring_sqe_set_data64(sqe, i)
+    _submit_and_reap(ring, cqe, count)
+
+    # 短写入（极少发生）时回退为普通写入补齐剩余数据；写入出错时删除本批文件
+    try:
+        for path, blob, n in zip(paths, blobs, written):
+            if n < 0:
+                raise OSError(-n, os.strerror(-n), path.decode())
+            if n < len(blob):
+                with open(path, 'r+b') as f:
+                    f.seek(n)
+                    f.write(blob[n:])
+    except BaseException:
+        _discard(paths)
+        raise
+
+
+def write_many(paths: List[str], blobs: List[bytes]) -> None:
+    """
+    使用 io_uring 批量写出多个文件
+    Args:
+        paths: 文件路径列表
+        blobs: 与路径一一对应的文件内容
+    """
+    if not IOURING_AVAILABLE:
+        raise RuntimeError("当前环境不支持io_uring")
+    if len(paths) != len(blobs):
+        raise ValueError("paths 与 blobs 长度不一致")
+
+    ring = liburing.io_uring()
+    cqe = liburing.io_uring_cqe()
+    liburing.io_uring_queue_init(QUEUE_DEPTH, ring, 0)
+    try:
+        encoded = [os.fsencode(path) for path in paths]
+        for start in range(0, len(encoded), QUEUE_DEPTH):
+            _write_batch(ring, cqe, encoded[start:start + QUEUE_DEPTH], blobs[start:start + QUEUE_DEPTH])
+    finally:
+        liburing.io_uring_queue_exit(ring)
@@ -0,0 +1,87 @@
+"""
+TTS近似文本缓存
+在精确匹配缓存之上，为仅有细微差异的文本（如标点、空白、大小写不同）
+复用已合成的音频。使用字符二元组的64位SimHash作为文本指纹，
+相似度 = 1 - 汉明距离 / 64，无需额外模型依赖。
+"""
+import re
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+SIMHASH_BITS = 64
+
+# 归一化时去除的空白与标点
+_NORMALIZE_PATTERN = re.compile(r'[\s\W_]+', re.UNICODE)
+
+
+def _simhash(text: str) -> int:
+    """计算文本的64位SimHash指纹"""
+    normalized = _NORMALIZE_PATTERN.sub('', text.lower())
+    if len(normalized) < 2:
+        features = [normalized]
+    else:
+        features = [normalized[i:i + 2] for i in range(len(normalized) - 1)]
+
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        h = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+class SemanticCache:
+    """近似文本索引：文本指纹 -> 精确缓存键，按条目数LRU淘汰"""
+
+    def __init__(self, capacity: int = 10000, threshold: float = 0.9):
+        """
+        Args:
+            capacity: 最多索引的条目数
+            threshold: 判定为近似文本的最低相似度
+        """
+        self.capacity = capacity
+        self.max_distance = int((1 - threshold) * SIMHASH_BITS)
+        # 分桶（相同合成参数）-> {精确缓存键: 指纹}
+        self._buckets: Dict[str, "OrderedDict[str, int]"] = {}
+        self._lru: "OrderedDict[str, str]" = OrderedDict()  # 精确缓存键 -> 分桶
+        self._lock = threading.Lock()
+
+    def add(self, bucket: str, text: str, cache_key: str) -> None:
+        """登记已缓存的文本"""
+        fingerprint = _simhash(text)
+        with self._lock:
+            self._buckets.setdefault(bucket, OrderedDict())[cache_key] = fingerprint
+            self._lru[cache_key] = bucket
+            self._lru.move_to_end(cache_key)
+            while len(self._lru) > self.capacity:
+                old_key, old_bucket = self._lru.popitem(last=False)
+                entries = self._buckets.get(old_bucket)
+                if entries is not None:
+                    entries.pop(old_key, None)
+                    if not entries:
+                        del self._buckets[old_bucket]
+
+    def lookup(self, bucket: str, text: str) -> Optional[str]:
+        """查找同一分桶中最相近且满足阈值的文本，返回其精确缓存键"""
+        fingerprint = _simhash(text)
+        best_key, best_distance = None, self.max_distance + 1
+        with self._lock:
+            entries = self._buckets.get(bucket)
+            if not entries:
+                return None
+            for cache_key, other in entries.items():
+                distance = bin(fingerprint ^ other).count("1")
+                if distance < best_distance:
+                    best_key, best_distance = cache_key, distance
+                    if distance == 0:
+                        break
+            if best_key is not None:
+                self._lru.move_to_end(best_key)
+        return best_key
@@ -0,0 +1,15 @@
+"""
+TTS文本的句子切分
+以中英文句末标点断句；英文句点只在其后为空白时断句，避免切开小数（3.14）、
+网址和文件名。
+"""
+import re
+from typing import List
+
+# 句子：以句末标点（可连续多个）结尾，或到文本末尾为止
+SENTENCE_PATTERN = re.compile(r'.+?(?:[。！？!?]+|\.(?=\s)|$)', re.S)
+
+
+def split_sentences(text: str) -> List[str]:
+    """按句末标点切分文本，去除首尾空白及空白句子"""
+    return [sentence for sentence in (part.strip() for part in SENTENCE_PATTERN.findall(text)) if sentence]
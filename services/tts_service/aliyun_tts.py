@@ -11,6 +11,20 @@ from .tts_models import TTSRequest, TTSResponse
 
 logger = logging.getLogger(__name__)
 
+_SUPPORTED_VOICES = (
+    {'id': 'Xiaoyun', 'name': '小云', 'gender': 'female', 'language': 'zh'},
+    {'id': 'Xiaogang', 'name': '小刚', 'gender': 'male', 'language': 'zh'},
+    {'id': 'Ruoxi', 'name': '若汐', 'gender': 'female', 'language': 'zh'},
+    {'id': 'Siqi', 'name': '思琪', 'gender': 'female', 'language': 'zh'},
+)
+_SUPPORTED_FORMATS = ('wav', 'mp3')
+_SUPPORTED_LANGUAGES = ('zh', 'en')
+
+_ALIYUN_NOT_IMPL_MSG = "阿里云TTS服务暂未完全实现，请联系开发者完善此功能"
+
+# 未实现提示每个进程只记录一次，避免每次请求刷屏
+_not_impl_logged = False
+
 
 class AliyunTTS(BaseTTS):
     """阿里云语音合成实现类"""
@@ -48,16 +62,7 @@ class AliyunTTS(BaseTTS):
         Returns:
             TTSResponse: 合成结果
         """
-        return self.synthesize_text(
-            text=request.text,
-            output_file=request.output_file,
-            voice=request.voice,
-            speed=request.speed,
-            pitch=request.pitch,
-            volume=request.volume,
-            language=request.language,
-            audio_format=request.audio_format
-        )
+        return self._not_implemented(request.text)
 
     def synthesize_text(self,
                        text: str,
@@ -82,39 +87,27 @@ class AliyunTTS(BaseTTS):
         Returns:
             TTSResponse: 合成结果
         """
-        try:
-            # TODO: 实现阿里云TTS API调用
-            # 这里应该调用阿里云的语音合成API
-            logger.warning("阿里云TTS暂未完全实现，返回模拟结果")
-            
-            # 返回错误响应，提示需要完整实现
-            return TTSResponse(
-                text=text,
-                success=False,
-                error_msg="阿里云TTS服务暂未完全实现，请联系开发者完善此功能"
-            )
-            
-        except Exception as e:
-            logger.error(f"阿里云TTS合成失败: {e}")
-            return TTSResponse(
-                text=text,
-                success=False,
-                error_msg=str(e)
-            )
+        # TODO: 实现阿里云TTS API调用
+        # 这里应该调用阿里云的语音合成API
+        return self._not_implemented(text)
+
+    @staticmethod
+    def _not_implemented(text: str) -> TTSResponse:
+        """返回未实现的错误响应"""
+        global _not_impl_logged
+        if not _not_impl_logged:
+            _not_impl_logged = True
+            logger.warning("阿里云TTS暂未完全实现，返回错误结果")
+        return TTSResponse(text=text, success=False, error_msg=_ALIYUN_NOT_IMPL_MSG)
 
     def get_supported_voices(self) -> List[Dict[str, Any]]:
         """获取支持的发音人列表"""
-        return [
-            {'id': 'Xiaoyun', 'name': '小云', 'gender': 'female', 'language': 'zh'},
-            {'id': 'Xiaogang', 'name': '小刚', 'gender': 'male', 'language': 'zh'},
-            {'id': 'Ruoxi', 'name': '若汐', 'gender': 'female', 'language': 'zh'},
-            {'id': 'Siqi', 'name': '思琪', 'gender': 'female', 'language': 'zh'},
-        ]
+        return [dict(voice) for voice in _SUPPORTED_VOICES]
 
     def get_supported_formats(self) -> List[str]:
         """获取支持的音频格式"""
-        return ['wav', 'mp3']
+        return list(_SUPPORTED_FORMATS)
 
     def get_supported_languages(self) -> List[str]:
         """获取支持的语言"""
-        return ['zh', 'en']
+        return list(_SUPPORTED_LANGUAGES)
@@ -3,10 +3,136 @@
 """
 import time
 import os
+import json
+import asyncio
+import hashlib
+import logging
+import functools
 import tempfile
-from typing import Dict, Any, List
+import threading
+import importlib.util
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple, Iterator, Callable, Sequence
+
+try:
+    import numpy as np
+    NUMPY_SUPPORT = True
+except ImportError:
+    NUMPY_SUPPORT = False
+
 from .tts_base import BaseTTS
 from .tts_models import TTSRequest, TTSResponse
+from . import _iouring_writer
+from ._semantic_cache import SemanticCache
+from ._audio_cache import AudioCache
+from ._sentences import SENTENCE_PATTERN
+
+logger = logging.getLogger(__name__)
+
+# 百度TTS单次请求的文本长度上限，以及超长文本切分时每段的目标长度
+MAX_TEXT_LENGTH = 1024
+CHUNK_TEXT_LENGTH = 1000
+
+# 超长文本分段并发合成的共享线程池，实际并发数由实例的API信号量限制
+CHUNK_WORKERS = 8
+_chunk_executor = ThreadPoolExecutor(max_workers=CHUNK_WORKERS, thread_name_prefix='baidu-chunk')
+
+# 合成结果磁盘缓存的默认容量上限，超出后按LRU淘汰
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# 音频时长估算：中文按每分钟300字计算
+CHARS_PER_MINUTE = 300
+
+# 发音人映射：对外名称 -> 百度发音人ID
+_VOICE_MAP = MappingProxyType({
+    'female': 0,     # 度小美（女声）
+    'male': 1,       # 度小宇（男声）
+    'duyaya': 3,     # 度逍遥（男声）
+    'duyanyan': 4,   # 度丫丫（女童声）
+})
+
+_SUPPORTED_VOICES = (
+    {'id': 'female', 'name': '度小美', 'gender': 'female', 'language': 'zh'},
+    {'id': 'male', 'name': '度小宇', 'gender': 'male', 'language': 'zh'},
+    {'id': 'duyaya', 'name': '度逍遥', 'gender': 'male', 'language': 'zh'},
+    {'id': 'duyanyan', 'name': '度丫丫', 'gender': 'female', 'language': 'zh', 'age': 'child'},
+)
+_SUPPORTED_FORMATS = ('mp3',)  # 百度TTS主要支持MP3格式
+_SUPPORTED_LANGUAGES = ('zh',)  # 百度TTS主要支持中文
+
+
+@functools.lru_cache(maxsize=256)
+def _options_core(speed: float, pitch: float, volume: float, voice: str) -> Dict[str, int]:
+    """计算百度合成参数模板；返回值被缓存共享，使用方需复制后再修改"""
+    return {
+        'spd': int(speed * 5),   # 语速，取值0-15，默认为5中语速
+        'pit': int(pitch * 5),   # 音调，取值0-15，默认为5中语调
+        'vol': int(volume * 15), # 音量，取值0-15，默认为5中音量
+        'per': _VOICE_MAP.get(voice, 1),  # 发音人选择，默认男声
+    }
+
+
+def _request_options(request: TTSRequest) -> Dict[str, Any]:
+    """构造单次请求的合成参数：复制缓存模板（避免修改共享对象）后合并额外参数"""
+    options = dict(_options_core(request.speed, request.pitch, request.volume, request.voice))
+    extra = request.extra
+    if extra:
+        # 额外参数通常只有一个，直接赋值比 dict.update 更轻
+        if len(extra) == 1:
+            (key, value), = extra.items()
+            options[key] = value
+        else:
+            options.update(extra)
+    return options
+
+
+# 流式合成直接调用的REST接口及每次产出的数据块大小
+TEXT2AUDIO_URL = 'https://tsn.baidu.com/text2audio'
+STREAM_CHUNK_SIZE = 4096
+
+def _write_audio_file(path: str, audio_data: bytes) -> None:
+    """直接通过文件描述符写出音频，跳过Python层缓冲；常见大小的MP3只需一次write"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        mv = memoryview(audio_data)
+        while mv:
+            n = os.write(fd, mv)
+            mv = mv[n:]
+    finally:
+        os.close(fd)
+
+
+def _split_sentences(text: str, max_len: int = CHUNK_TEXT_LENGTH) -> List[str]:
+    """按句子边界切分文本，并贪心合并为不超过 max_len 的分段"""
+    chunks = []
+    current = ''
+    for sentence in SENTENCE_PATTERN.findall(text):
+        # 单句本身超长时按长度硬切分
+        while len(sentence) > max_len:
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(sentence[:max_len])
+            sentence = sentence[max_len:]
+        if len(current) + len(sentence) > max_len:
+            chunks.append(current)
+            current = sentence
+        else:
+            current += sentence
+    if current:
+        chunks.append(current)
+    return [chunk for chunk in chunks if chunk.strip()]
+
+
+def _cache_key(text: str, lang: str, options: Dict[str, Any]) -> str:
+    """根据规范化后的请求参数生成缓存键"""
+    extra = json.dumps(
+        {k: v for k, v in options.items() if k not in ('spd', 'pit', 'vol', 'per')},
+        sort_keys=True, ensure_ascii=False
+    )
+    raw = f"{text}|{options.get('per')}|{options.get('spd')}|{options.get('pit')}|{options.get('vol')}|{lang}|{extra}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
 
 
 class BaiduTTS(BaseTTS):
@@ -20,106 +146,299 @@ class BaiduTTS(BaseTTS):
                 raise ValueError(f"百度TTS配置缺少必要参数: {key}")
 
     def _init_client(self) -> None:
-        """初始化百度TTS客户端"""
-        try:
-            from aip import AipSpeech
-            self.client = AipSpeech(
-                self.config['app_id'],
-                self.config['api_key'],
-                self.config['secret_key']
+        """初始化百度TTS客户端（SDK在首次合成时才导入并创建）"""
+        if importlib.util.find_spec('aip') is None:
+            raise ImportError("请安装百度AI SDK: pip install baidu-aip")
+
+        self._client = None
+        self._session = None
+        self._client_lock = threading.Lock()
+
+        # 每个字符对应的估算音频时长（秒）
+        self._sec_per_char = 60.0 / CHARS_PER_MINUTE
+
+        # 临时文件目录只需解析一次
+        self._tmp_dir = tempfile.gettempdir()
+
+        # 合成结果缓存（按分段缓存，内存LRU + 按总字节数LRU淘汰的磁盘缓存），可通过 cache_enabled=False 关闭；
+        # 启用时由该缓存负责百度的结果缓存，TTS管理器不再重复缓存
+        self._cache = None
+        if self.config.get('cache_enabled', True):
+            cache_dir = self.config.get('cache_dir') or os.path.join(self._tmp_dir, 'baidu_tts_cache')
+            self._cache = AudioCache(
+                cache_dir,
+                int(self.config.get('cache_max_bytes', DEFAULT_CACHE_MAX_BYTES)),
+                int(self.config.get('cache_memory_size', 128))
+            )
+        self.caches_results = self._cache is not None
+
+        # 近似文本缓存（默认关闭），在精确缓存未命中时复用相似文本的音频
+        self._semantic_cache = None
+        if self._cache is not None and self.config.get('semantic_cache', False):
+            self._semantic_cache = SemanticCache(
+                capacity=int(self.config.get('semantic_cache_size', 10000)),
+                threshold=float(self.config.get('semantic_cache_threshold', 0.9))
             )
+
+        # 并发调用远程API的上限，可通过配置 max_concurrency 或环境变量 TTS_CONCURRENT_REQUESTS 设置
+        self._max_concurrency = int(self.config.get('max_concurrency') or os.getenv('TTS_CONCURRENT_REQUESTS', 3))
+        # 每次远程API调用（包括超长文本的各个分段）都需获取该信号量，保证总并发不超过上限
+        self._api_sem = threading.BoundedSemaphore(self._max_concurrency)
+
+        # 批量合成时是否使用io_uring一次性写出所有文件（仅Linux 5.6+且安装liburing时生效）
+        self._use_iouring = bool(self.config.get('use_iouring', False)) and _iouring_writer.IOURING_AVAILABLE
+
+    def _ensure_client(self):
+        """获取AipSpeech客户端，首次调用时才导入SDK并创建"""
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from aip import AipSpeech
+                    client = AipSpeech(
+                        self.config['app_id'],
+                        self.config['api_key'],
+                        self.config['secret_key']
+                    )
+                    self._install_pooled_session(client)
+                    self._client = client
+        return self._client
+
+    def _install_pooled_session(self, client) -> None:
+        """为AipSpeech替换带连接池的requests.Session，复用TCP/TLS连接"""
+        try:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
         except ImportError:
-            raise ImportError("请安装百度AI SDK: pip install baidu-aip")
+            return
+
+        # AipBase 内部通过私有属性 __client（默认是 requests 模块）发起请求
+        if not hasattr(client, '_AipBase__client'):
+            logger.warning("当前baidu-aip版本不支持替换HTTP客户端，继续使用默认连接")
+            return
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            # 合成请求为POST，只在连接未建立时重试，请求已发出后不再重发
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.2)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+        client._AipBase__client = session
+        self._session = session
+        logger.info("百度TTS已启用HTTP连接池")
+
+    def _fetch_audio(self, text: str, language: str, options: Dict[str, Any]) -> Tuple[Any, bool]:
+        """
+        合成单段文本（优先读取缓存）
+        Returns:
+            (音频数据或百度返回的错误字典, 是否命中缓存)
+        """
+        cache_key = None
+        bucket = None
+        if self._cache is not None:
+            cache_key = _cache_key(text, language, options)
+            cached = self._cache.get_bytes(cache_key)
+            if cached is not None:
+                return cached, True
+            
+            # 近似文本只在合成参数完全相同的条目中查找
+            if self._semantic_cache is not None:
+                bucket = _cache_key('', language, options)
+                similar_key = self._semantic_cache.lookup(bucket, text)
+                cached = self._cache.get_bytes(similar_key) if similar_key else None
+                if cached is not None:
+                    return cached, True
+        
+        # 调用百度TTS API
+        client = self._ensure_client()
+        with self._api_sem:
+            result = client.synthesis(
+                text,
+                language,
+                1,  # 客户端类型选择，web端填写固定值1
+                options
+            )
+        
+        if not isinstance(result, dict) and cache_key is not None:
+            self._cache.put(cache_key, '.mp3', audio_data=result)
+            if bucket is not None:
+                self._semantic_cache.add(bucket, text, cache_key)
+        return result, False
+
+    def _fetch_chunks(self, chunks: List[str], language: str, options: Dict[str, Any]) -> List[Tuple[Any, bool]]:
+        """并发合成多段文本（使用共享线程池，每段调用受API信号量限制），结果顺序与分段顺序一致"""
+        return list(_chunk_executor.map(lambda chunk: self._fetch_audio(chunk, language, options), chunks))
 
     def synthesize(self, request: TTSRequest) -> TTSResponse:
         """执行文本转语音"""
-        start_time = time.time()
+        return self._synthesize(request)
+
+    def _synthesize(self, request: TTSRequest, write_file: bool = True) -> TTSResponse:
+        """执行文本转语音，write_file=False 时只确定输出路径，由调用方负责写出文件"""
+        t0 = time.perf_counter_ns()
         
         try:
-            # 检查文本长度
-            if not request.text or len(request.text.strip()) == 0:
-                return TTSResponse(
-                    text=request.text,
-                    success=False,
-                    error_msg="文本内容不能为空",
-                    duration=time.time() - start_time
-                )
-            
-            # 百度TTS文本长度限制为1024个字符
-            if len(request.text) > 1024:
-                return TTSResponse(
-                    text=request.text,
-                    success=False,
-                    error_msg="文本长度超过1024个字符限制",
-                    duration=time.time() - start_time
-                )
+            # 检查文本是否为空（isspace不会复制字符串）
+            text = request.text
+            if not text or text.isspace():
+                return self._err(text, "文本内容不能为空", t0)
             
             # 设置合成参数
-            options = {
-                'spd': int(request.speed * 5),  # 语速，取值0-15，默认为5中语速
-                'pit': int(request.pitch * 5),  # 音调，取值0-15，默认为5中语调
-                'vol': int(request.volume * 15), # 音量，取值0-15，默认为5中音量
-                'per': self._get_voice_id(request.voice),  # 发音人选择
-            }
+            options = _request_options(request)
+            language = request.language or 'zh'
             
-            # 添加额外参数
-            if request.extra:
-                options.update(request.extra)
+            # 百度TTS单次请求文本长度限制为1024个字符，超长文本按句切分后并发合成
+            text_len = len(text)
+            if text_len > MAX_TEXT_LENGTH:
+                chunks = _split_sentences(text, CHUNK_TEXT_LENGTH)
+                results = self._fetch_chunks(chunks, language, options)
+            else:
+                results = [self._fetch_audio(text, language, options)]
             
-            # 调用百度TTS API
-            result = self.client.synthesis(
-                request.text,
-                request.language or 'zh',
-                1,  # 客户端类型选择，web端填写固定值1
-                options
-            )
+            # 处理结果
+            for result, _ in results:
+                if isinstance(result, dict):
+                    # 错误响应
+                    return self._err(text, result.get('err_msg', '合成失败'), t0, result)
             
-            duration = time.time() - start_time
+            # MP3帧自带同步头，各段音频可直接按顺序拼接
+            audio_data = results[0][0] if len(results) == 1 else b''.join(result for result, _ in results)
+            cache_hit = all(hit for _, hit in results)
+            audio_file = request.output_file
+            
+            # 如果没有指定输出文件，创建临时文件（mkstemp保证并发下文件名不冲突）
+            if not audio_file:
+                fd, audio_file = tempfile.mkstemp(prefix='tts_', suffix='.mp3', dir=self._tmp_dir)
+                os.close(fd)
+            
+            # 保存音频文件
+            if write_file:
+                _write_audio_file(audio_file, audio_data)
             
-            # 处理结果
-            if not isinstance(result, dict):
-                # 成功返回音频数据
-                audio_data = result
-                audio_file = request.output_file
-                
-                # 如果没有指定输出文件，创建临时文件
-                if not audio_file:
-                    temp_dir = tempfile.gettempdir()
-                    audio_file = os.path.join(temp_dir, f"tts_{int(time.time())}.mp3")
-                
-                # 保存音频文件
-                with open(audio_file, 'wb') as f:
-                    f.write(audio_data)
-                
-                # 获取文件信息
-                file_size = len(audio_data)
-                
-                return TTSResponse(
-                    text=request.text,
-                    audio_file=audio_file,
-                    audio_data=audio_data,
-                    success=True,
-                    duration=duration,
-                    audio_length=self._estimate_audio_length(request.text),
-                    file_size=file_size
-                )
-            else:
-                # 错误响应
-                return TTSResponse(
-                    text=request.text,
-                    success=False,
-                    error_msg=result.get('err_msg', '合成失败'),
-                    duration=duration,
-                    extra_info=result
-                )
-                
-        except Exception as e:
             return TTSResponse(
                 text=request.text,
-                success=False,
-                error_msg=str(e),
-                duration=time.time() - start_time
+                audio_file=audio_file,
+                audio_data=audio_data,
+                success=True,
+                duration=(time.perf_counter_ns() - t0) * 1e-9,
+                audio_length=text_len * self._sec_per_char,
+                file_size=len(audio_data),
+                extra_info={'cache_hit': cache_hit, 'chunks': len(results)}
             )
+                
+        except Exception as e:
+            return self._err(request.text, str(e), t0)
+
+    @staticmethod
+    def _err(text: str, error_msg: str, t0: int, extra_info: Any = None) -> TTSResponse:
+        """构造失败响应，耗时从 t0（perf_counter_ns）起算"""
+        return TTSResponse(
+            text=text,
+            success=False,
+            error_msg=error_msg,
+            duration=(time.perf_counter_ns() - t0) * 1e-9,
+            extra_info=extra_info
+        )
+
+    def synthesize_stream(self, request: TTSRequest,
+                          on_chunk: Optional[Callable[[bytes], None]] = None) -> Iterator[bytes]:
+        """
+        流式合成：绕过SDK直接请求 text2audio 接口，边接收边产出MP3数据块
+        Args:
+            request: TTS请求参数
+            on_chunk: 每收到一个数据块时的回调（可选）
+        Returns:
+            Iterator[bytes]: MP3数据块迭代器
+        """
+        text = request.text
+        if not text or text.isspace():
+            raise ValueError("文本内容不能为空")
+
+        client = self._ensure_client()
+        import requests
+        http = self._session or requests
+        token = client._auth()['access_token']
+
+        params = {
+            'tok': token,
+            'cuid': str(self.config['app_id']),
+            'ctp': 1,
+            'lan': request.language or 'zh',
+            'aue': 3,  # mp3
+            **_options_core(request.speed, request.pitch, request.volume, request.voice)
+        }
+        if request.extra:
+            params.update(request.extra)
+
+        chunks = _split_sentences(text) if len(text) > MAX_TEXT_LENGTH else [text]
+        for chunk in chunks:
+            with http.post(TEXT2AUDIO_URL, data={**params, 'tex': chunk}, stream=True, timeout=60) as response:
+                # 合成失败时接口返回JSON错误信息而不是音频
+                if response.headers.get('Content-Type', '').startswith('application/json'):
+                    raise RuntimeError(response.json().get('err_msg', '合成失败'))
+                for data in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    if not data:
+                        continue
+                    if on_chunk:
+                        on_chunk(data)
+                    yield data
+
+    async def synthesize_async(self, request: TTSRequest, write_file: bool = True) -> TTSResponse:
+        """异步执行文本转语音，在线程中调用同步API（并发数由API信号量限制）"""
+        return await asyncio.to_thread(self._synthesize, request, write_file)
+
+    def prewarm(self, texts: List[str], common_kwargs: Dict[str, Any] = None) -> List[asyncio.Task]:
+        """
+        预先在后台合成即将用到的文本（如脚本中的后续台词）并写入缓存，
+        之后对同样文本的 synthesize 调用将直接命中缓存。需在事件循环中调用。
+        Args:
+            texts: 待预合成的文本列表
+            common_kwargs: 构造 TTSRequest 的公共参数（voice、speed 等）
+        Returns:
+            List[asyncio.Task]: 后台任务列表，调用方可在退出时取消
+        """
+        if self._cache is None:
+            logger.warning("百度TTS缓存未启用，跳过预合成")
+            return []
+        common_kwargs = common_kwargs or {}
+        return [asyncio.create_task(self._prewarm_one(TTSRequest(text=text, **common_kwargs)))
+                for text in texts if text and not text.isspace()]
+
+    async def _prewarm_one(self, request: TTSRequest) -> None:
+        """预合成单条文本，只填充缓存，不写出输出文件"""
+        options = _request_options(request)
+        language = request.language or 'zh'
+        chunks = _split_sentences(request.text) if len(request.text) > MAX_TEXT_LENGTH else [request.text]
+        for chunk in chunks:
+            try:
+                await asyncio.to_thread(self._fetch_audio, chunk, language, options)
+            except Exception as e:
+                logger.warning(f"百度TTS预合成失败: {e}")
+                return
+
+    async def synthesize_batch(self, requests: List[TTSRequest]) -> List[TTSResponse]:
+        """并发合成多条文本，返回结果顺序与请求顺序一致；所有文件在最后统一写出"""
+        responses = await asyncio.gather(*(self.synthesize_async(r, write_file=False) for r in requests))
+        await asyncio.to_thread(self._write_responses, [r for r in responses if r.success])
+        return responses
+
+    def _write_responses(self, responses: List[TTSResponse]) -> None:
+        """将批量合成结果写出到各自的输出文件"""
+        if not responses:
+            return
+        if self._use_iouring:
+            try:
+                _iouring_writer.write_many([r.audio_file for r in responses],
+                                           [r.audio_data for r in responses])
+                return
+            except Exception as e:
+                logger.warning(f"io_uring批量写出失败，回退为逐个写出: {e}")
+        for response in responses:
+            _write_audio_file(response.audio_file, response.audio_data)
 
     def synthesize_text(self, 
                        text: str,
@@ -145,33 +464,33 @@ class BaiduTTS(BaseTTS):
 
     def _get_voice_id(self, voice: str) -> int:
         """获取发音人ID"""
-        voice_map = {
-            'female': 0,     # 度小美（女声）
-            'male': 1,       # 度小宇（男声）
-            'duyaya': 3,     # 度逍遥（男声）
-            'duyanyan': 4,   # 度丫丫（女童声）
-        }
-        return voice_map.get(voice, 1)  # 默认男声
+        return _VOICE_MAP.get(voice, 1)  # 默认男声
     
     def get_supported_voices(self) -> List[Dict[str, Any]]:
         """获取支持的发音人列表"""
-        return [
-            {'id': 'female', 'name': '度小美', 'gender': 'female', 'language': 'zh'},
-            {'id': 'male', 'name': '度小宇', 'gender': 'male', 'language': 'zh'},
-            {'id': 'duyaya', 'name': '度逍遥', 'gender': 'male', 'language': 'zh'},
-            {'id': 'duyanyan', 'name': '度丫丫', 'gender': 'female', 'language': 'zh', 'age': 'child'},
-        ]
+        return [dict(voice) for voice in _SUPPORTED_VOICES]
     
     def get_supported_formats(self) -> List[str]:
         """获取支持的音频格式"""
-        return ['mp3']  # 百度TTS主要支持MP3格式
+        return list(_SUPPORTED_FORMATS)
     
     def get_supported_languages(self) -> List[str]:
         """获取支持的语言"""
-        return ['zh']  # 百度TTS主要支持中文
+        return list(_SUPPORTED_LANGUAGES)
     
     def _estimate_audio_length(self, text: str) -> float:
         """估算音频时长（秒）"""
-        # 简单估算：中文按每分钟300字计算
-        chars_per_minute = 300
-        return len(text) / chars_per_minute * 60
+        return len(text) * self._sec_per_char
+
+    def estimate_audio_lengths(self, texts: Sequence[str]):
+        """
+        批量估算音频时长（秒）
+        Args:
+            texts: 文本列表
+        Returns:
+            安装numpy时返回 float64 数组，否则返回浮点数列表
+        """
+        if NUMPY_SUPPORT:
+            lens = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+            return lens * self._sec_per_char
+        return [len(t) * self._sec_per_char for t in texts]
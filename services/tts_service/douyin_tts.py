@@ -2,29 +2,103 @@
 抖音（火山引擎）语音合成服务实现
 支持流式语音合成和多种音色选择
 """
+import re
 import asyncio
-import io
+import atexit
 import struct
 import json
+import time
 import uuid
-import base64
+import binascii
+import inspect
+import functools
+import threading
+import weakref
+from collections import deque
 from loguru import logger
-from typing import Dict, Any, List, Optional, Callable
+from typing import Dict, Any, List, Optional, Callable, Tuple
 from dataclasses import dataclass
-from enum import IntEnum
 import websockets
 import ssl
 import os
 from urllib.parse import urlparse
 
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
 from .tts_base import BaseTTS
+from ._douyin_codec import (
+    parse_header, parse_body, marshal_full_client_request, parse_audio_only_server
+)
 from .tts_models import TTSRequest, TTSResponse
 
 # 使用loguru作为日志库
 
+# 内存累积音频时按预估时长分配初始缓冲区：中文约每秒4字；wav/pcm按默认24kHz 16位单声道，
+# 压缩格式（mp3/ogg_opus）按约64kbps估算。预估不足时缓冲区成倍扩容，因此初始大小不超过池上限
+CHARS_PER_SECOND = 4
+_PCM_BYTES_PER_SECOND = 48000
+_COMPRESSED_BYTES_PER_SECOND = 8000
+MIN_AUDIO_BUFFER = 64 * 1024
+
+# 内存累积用缓冲区池：跨请求复用已分配的bytearray，超过上限的大缓冲区不回收
+AUDIO_BUFFER_POOL_SIZE = 4
+AUDIO_BUFFER_POOL_MAX_BYTES = 4 * 1024 * 1024
+_audio_buffer_pool: deque = deque(maxlen=AUDIO_BUFFER_POOL_SIZE)
+
+
+def _rent_audio_buffer(capacity: int) -> bytearray:
+    """从池中取出缓冲区（容量不足时扩容），池为空时新建"""
+    try:
+        buf = _audio_buffer_pool.pop()
+    except IndexError:
+        return bytearray(capacity)
+    if len(buf) < capacity:
+        buf += bytes(capacity - len(buf))
+    return buf
+
+
+def _estimate_audio_bytes(text_len: int, encoding: str) -> int:
+    """按文本长度与编码预估音频大小，限制在 [MIN_AUDIO_BUFFER, AUDIO_BUFFER_POOL_MAX_BYTES] 内"""
+    rate = _PCM_BYTES_PER_SECOND if (encoding or '').lower() in ('wav', 'pcm') else _COMPRESSED_BYTES_PER_SECOND
+    return min(max(MIN_AUDIO_BUFFER, text_len * rate // CHARS_PER_SECOND), AUDIO_BUFFER_POOL_MAX_BYTES)
+
+
+def _return_audio_buffer(buf: bytearray) -> None:
+    """归还缓冲区"""
+    if len(buf) <= AUDIO_BUFFER_POOL_MAX_BYTES:
+        _audio_buffer_pool.append(buf)
+
+
+def _json_bytes(obj: Any) -> bytes:
+    """序列化为UTF-8 JSON字节，优先使用orjson"""
+    if ORJSON_SUPPORT:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
 
-class MsgType(IntEnum):
-    """消息类型枚举"""
+
+# 合成请求中固定不变的尾部字段
+_REQUEST_TAIL = (
+    b',"operation":"submit","with_timestamp":"1","extra_param":'
+    + _json_bytes(json.dumps({"disable_markdown_filter": False}))
+    + b'}}'
+)
+
+# stream_writer输出的音频块SSE事件（与流式接口的audio_chunk事件字段一致），data为base64
+_SSE_CHUNK_PREFIX = b'data: {"type":"audio_chunk","data":"'
+_SSE_CHUNK_SUFFIX = b'","chunk_count":%d,"total_size":%d,"is_final":%s}\n\n'
+
+# 预编译的二进制字段格式（大端序）
+_I32 = struct.Struct(">i")
+_U32 = struct.Struct(">I")
+_HDR = struct.Struct(">BBB")
+
+
+class MsgType:
+    """消息类型常量"""
     Invalid = 0
     FullClientRequest = 0b1
     AudioOnlyClient = 0b10
@@ -35,7 +109,7 @@ class MsgType(IntEnum):
     ServerACK = AudioOnlyServer
 
 
-class MsgTypeFlagBits(IntEnum):
+class MsgTypeFlagBits:
     """消息类型标志位"""
     NoSeq = 0
     PositiveSeq = 0b1
@@ -44,17 +118,17 @@ class MsgTypeFlagBits(IntEnum):
     WithEvent = 0b100
 
 
-class VersionBits(IntEnum):
+class VersionBits:
     """版本位"""
     Version1 = 1
 
 
-class HeaderSizeBits(IntEnum):
+class HeaderSizeBits:
     """头部大小位"""
     HeaderSize4 = 1
 
 
-class SerializationBits(IntEnum):
+class SerializationBits:
     """序列化方法位"""
     Raw = 0
     JSON = 0b1
@@ -62,15 +136,15 @@ class SerializationBits(IntEnum):
     Custom = 0b1111
 
 
-class CompressionBits(IntEnum):
+class CompressionBits:
     """压缩方法位"""
     None_ = 0
     Gzip = 0b1
     Custom = 0b1111
 
 
-class EventType(IntEnum):
-    """事件类型枚举"""
+class EventType:
+    """事件类型常量"""
     None_ = 0
     StartConnection = 1
     FinishConnection = 2
@@ -79,21 +153,52 @@ class EventType(IntEnum):
     TaskRequest = 200
 
 
+def _valid_values(cls: type) -> frozenset:
+    """收集常量类中定义的全部取值，用于解析时校验"""
+    return frozenset(v for k, v in vars(cls).items() if not k.startswith('_'))
+
+
+_VALID_VALUES = {
+    cls: _valid_values(cls)
+    for cls in (MsgType, MsgTypeFlagBits, VersionBits, HeaderSizeBits,
+                SerializationBits, CompressionBits, EventType)
+}
+
+
+# 携带序列号字段的消息类型与标志位，以及不携带会话ID的连接级事件
+_TYPES_WITH_SEQ = frozenset([
+    MsgType.FullClientRequest,
+    MsgType.FullServerResponse,
+    MsgType.FrontEndResultServer,
+    MsgType.AudioOnlyClient,
+    MsgType.AudioOnlyServer,
+])
+_SEQ_FLAGS = frozenset([MsgTypeFlagBits.PositiveSeq, MsgTypeFlagBits.NegativeSeq])
+_CONNECTION_EVENTS = frozenset([EventType.StartConnection, EventType.FinishConnection])
+
+
+def _checked(cls: type, value: int) -> int:
+    """校验字段取值，非法时抛出ValueError"""
+    if value not in _VALID_VALUES[cls]:
+        raise ValueError(f"{value} is not a valid {cls.__name__}")
+    return value
+
+
 @dataclass
 class Message:
     """消息对象"""
-    version: VersionBits = VersionBits.Version1
-    header_size: HeaderSizeBits = HeaderSizeBits.HeaderSize4
-    type: MsgType = MsgType.Invalid
-    flag: MsgTypeFlagBits = MsgTypeFlagBits.NoSeq
-    serialization: SerializationBits = SerializationBits.JSON
-    compression: CompressionBits = CompressionBits.None_
-    event: EventType = EventType.None_
+    version: int = VersionBits.Version1
+    header_size: int = HeaderSizeBits.HeaderSize4
+    type: int = MsgType.Invalid
+    flag: int = MsgTypeFlagBits.NoSeq
+    serialization: int = SerializationBits.JSON
+    compression: int = CompressionBits.None_
+    event: int = EventType.None_
     session_id: str = ""
     connect_id: str = ""
     sequence: int = 0
     error_code: int = 0
-    payload: bytes = b""
+    payload: bytes = b""  # AudioOnlyServer消息为原始帧的memoryview切片
     
     @classmethod
     def from_bytes(cls, data: bytes) -> "Message":
@@ -102,16 +207,12 @@ class Message:
             if len(data) < 3:
                 raise ValueError(f"数据太短：期望至少3字节，得到{len(data)}")
             
-            logger.debug(f"解析消息，数据长度: {len(data)}，前8字节: {data[:8].hex()}")
-            
             type_and_flag = data[1]
             msg_type_value = type_and_flag >> 4
             flag_value = type_and_flag & 0b00001111
             
-            logger.debug(f"消息类型值: {msg_type_value}, 标志值: {flag_value}")
-            
-            msg_type = MsgType(msg_type_value)
-            flag = MsgTypeFlagBits(flag_value)
+            msg_type = _checked(MsgType, msg_type_value)
+            flag = _checked(MsgTypeFlagBits, flag_value)
             
             msg = cls(type=msg_type, flag=flag)
             msg.unmarshal(data)
@@ -121,198 +222,302 @@ class Message:
             logger.error(f"消息数据: {data[:min(len(data), 20)].hex()}")
             raise
     
-    def marshal(self) -> bytes:
-        """序列化消息为字节"""
-        buffer = io.BytesIO()
+    def marshal(self) -> bytearray:
+        """序列化消息为字节（先计算总长度，一次分配后按偏移写入各字段）"""
+        header_size = 4 * self.header_size
+        with_event = self.flag == MsgTypeFlagBits.WithEvent
+        
+        session_id_bytes = None
+        if with_event and self.event not in _CONNECTION_EVENTS:
+            session_id_bytes = self.session_id.encode("utf-8")
+            if len(session_id_bytes) > 0xFFFFFFFF:
+                raise ValueError(f"会话ID大小({len(session_id_bytes)})超过最大值(uint32)")
+        
+        if self.type in _TYPES_WITH_SEQ:
+            has_int_field = self.flag in _SEQ_FLAGS
+        else:
+            has_int_field = self.type == MsgType.Error
         
-        # 写入头部
-        header = [
+        size = len(self.payload)
+        if size > 0xFFFFFFFF:
+            raise ValueError(f"载荷大小({size})超过最大值(uint32)")
+        
+        total = header_size + 4 + size
+        if with_event:
+            total += 4
+        if session_id_bytes is not None:
+            total += 4 + len(session_id_bytes)
+        if has_int_field:
+            total += 4
+        buf = bytearray(total)
+        
+        # 写入头部（填充字节保持为0）
+        _HDR.pack_into(
+            buf, 0,
             (self.version << 4) | self.header_size,
             (self.type << 4) | self.flag,
             (self.serialization << 4) | self.compression,
-        ]
-        
-        header_size = 4 * self.header_size
-        if padding := header_size - len(header):
-            header.extend([0] * padding)
-        
-        buffer.write(bytes(header))
+        )
+        off = header_size
         
         # 写入其他字段
-        writers = self._get_writers()
-        for writer in writers:
-            writer(buffer)
+        if with_event:
+            _I32.pack_into(buf, off, self.event)
+            off += 4
+            if session_id_bytes is not None:
+                _U32.pack_into(buf, off, len(session_id_bytes))
+                off += 4
+                buf[off:off + len(session_id_bytes)] = session_id_bytes
+                off += len(session_id_bytes)
         
-        return buffer.getvalue()
+        if has_int_field:
+            if self.type == MsgType.Error:
+                _U32.pack_into(buf, off, self.error_code)
+            else:
+                _I32.pack_into(buf, off, self.sequence)
+            off += 4
+        
+        _U32.pack_into(buf, off, size)
+        buf[off + 4:] = self.payload
+        return buf
     
     def unmarshal(self, data: bytes) -> None:
         """从字节反序列化消息"""
-        buffer = io.BytesIO(data)
-        
-        # 读取版本和头部大小
-        version_and_header_size = buffer.read(1)[0]
-        self.version = VersionBits(version_and_header_size >> 4)
-        self.header_size = HeaderSizeBits(version_and_header_size & 0b00001111)
+        mv = memoryview(data)
         
-        # 跳过第二字节
-        buffer.read(1)
+        # 读取版本和头部大小；第二字节（类型与标志）已在from_bytes中解析
+        version, header_size, _, _, serialization_value, compression_value = parse_header(mv)
+        self.version = _checked(VersionBits, version)
+        self.header_size = _checked(HeaderSizeBits, header_size)
         
         # 读取序列化和压缩方法
-        serialization_compression = buffer.read(1)[0]
         try:
-            serialization_value = serialization_compression >> 4
-            compression_value = serialization_compression & 0b00001111
-            logger.debug(f"解析消息头: serialization_value={serialization_value}, compression_value={compression_value}")
-            self.serialization = SerializationBits(serialization_value)
-            self.compression = CompressionBits(compression_value)
+            self.serialization = _checked(SerializationBits, serialization_value)
+            self.compression = _checked(CompressionBits, compression_value)
         except ValueError as e:
             logger.error(f"解析消息头失败: {e}")
             logger.error(f"原始字节: {data[:10].hex()} (前10字节)")
-            logger.error(f"serialization_compression: {serialization_compression:08b} ({serialization_compression})")
+            logger.error(f"serialization_compression: {mv[2]:08b} ({mv[2]})")
             logger.error(f"serialization_value: {serialization_value}, compression_value: {compression_value}")
             raise
         
         # 跳过头部填充
-        header_size = 4 * self.header_size
-        read_size = 3
-        if padding_size := header_size - read_size:
-            buffer.read(padding_size)
-        
-        # 读取其他字段
-        readers = self._get_readers()
-        for reader in readers:
-            reader(buffer)
-    
-    def _get_writers(self) -> List[Callable[[io.BytesIO], None]]:
-        """获取写入函数列表"""
-        writers = []
-        
-        if self.flag == MsgTypeFlagBits.WithEvent:
-            writers.extend([self._write_event, self._write_session_id])
+        off = 4 * self.header_size
         
-        if self.type in [
-            MsgType.FullClientRequest,
-            MsgType.FullServerResponse,
-            MsgType.FrontEndResultServer,
-            MsgType.AudioOnlyClient,
-            MsgType.AudioOnlyServer,
-        ]:
-            if self.flag in [MsgTypeFlagBits.PositiveSeq, MsgTypeFlagBits.NegativeSeq]:
-                writers.append(self._write_sequence)
-        elif self.type == MsgType.Error:
-            writers.append(self._write_error_code)
-        
-        writers.append(self._write_payload)
-        return writers
-    
-    def _get_readers(self) -> List[Callable[[io.BytesIO], None]]:
-        """获取读取函数列表"""
-        readers = []
+        # 不带事件的消息只有定长整数字段，由编解码模块一次解出
+        if self.flag != MsgTypeFlagBits.WithEvent:
+            self.sequence, self.error_code, off, size = parse_body(mv, off, self.type, self.flag)
+            if size:
+                self._set_payload(mv[off:off + size])
+            return
         
-        if self.type in [
-            MsgType.FullClientRequest,
-            MsgType.FullServerResponse,
-            MsgType.FrontEndResultServer,
-            MsgType.AudioOnlyClient,
-            MsgType.AudioOnlyServer,
-        ]:
-            if self.flag in [MsgTypeFlagBits.PositiveSeq, MsgTypeFlagBits.NegativeSeq]:
-                readers.append(self._read_sequence)
-        elif self.type == MsgType.Error:
-            readers.append(self._read_error_code)
+        # 读取其他字段
+        end = len(mv)
+        if self.type in _TYPES_WITH_SEQ:
+            if self.flag in _SEQ_FLAGS and off + 4 <= end:
+                self.sequence = _I32.unpack_from(mv, off)[0]
+                off += 4
+        elif self.type == MsgType.Error and off + 4 <= end:
+            self.error_code = _U32.unpack_from(mv, off)[0]
+            off += 4
         
         if self.flag == MsgTypeFlagBits.WithEvent:
-            readers.extend([self._read_event, self._read_session_id, self._read_connect_id])
+            if off + 4 <= end:
+                self.event = _checked(EventType, _I32.unpack_from(mv, off)[0])
+                off += 4
+            off = self._read_session_id(mv, off)
+            off = self._read_connect_id(mv, off)
         
-        readers.append(self._read_payload)
-        return readers
-    
-    def _write_event(self, buffer: io.BytesIO) -> None:
-        """写入事件"""
-        buffer.write(struct.pack(">i", self.event))
+        self._read_payload(mv, off)
     
-    def _write_session_id(self, buffer: io.BytesIO) -> None:
-        """写入会话ID"""
-        if self.event in [EventType.StartConnection, EventType.FinishConnection]:
-            return
+    def _read_session_id(self, mv: memoryview, off: int) -> int:
+        """读取会话ID，返回新的偏移"""
+        if self.event in _CONNECTION_EVENTS:
+            return off
         
-        session_id_bytes = self.session_id.encode("utf-8")
-        size = len(session_id_bytes)
-        if size > 0xFFFFFFFF:
-            raise ValueError(f"会话ID大小({size})超过最大值(uint32)")
-        
-        buffer.write(struct.pack(">I", size))
-        if size > 0:
-            buffer.write(session_id_bytes)
+        if off + 4 <= len(mv):
+            size = _U32.unpack_from(mv, off)[0]
+            off += 4
+            if size > 0:
+                session_id_bytes = mv[off:off + size]
+                off += len(session_id_bytes)
+                if len(session_id_bytes) == size:
+                    self.session_id = str(session_id_bytes, "utf-8")
+        return off
     
-    def _write_sequence(self, buffer: io.BytesIO) -> None:
-        """写入序列号"""
-        buffer.write(struct.pack(">i", self.sequence))
+    def _read_connect_id(self, mv: memoryview, off: int) -> int:
+        """读取连接ID，返回新的偏移"""
+        if off + 4 <= len(mv):
+            size = _U32.unpack_from(mv, off)[0]
+            off += 4
+            if size > 0:
+                connect_id_bytes = mv[off:off + size]
+                off += len(connect_id_bytes)
+                self.connect_id = str(connect_id_bytes, "utf-8")
+        return off
     
-    def _write_error_code(self, buffer: io.BytesIO) -> None:
-        """写入错误码"""
-        buffer.write(struct.pack(">I", self.error_code))
+    def _read_payload(self, mv: memoryview, off: int) -> int:
+        """读取载荷，返回新的偏移"""
+        if off + 4 <= len(mv):
+            size = _U32.unpack_from(mv, off)[0]
+            off += 4
+            if size > 0:
+                payload = mv[off:off + size]
+                off += len(payload)
+                self._set_payload(payload)
+        return off
     
-    def _write_payload(self, buffer: io.BytesIO) -> None:
-        """写入载荷"""
-        size = len(self.payload)
-        if size > 0xFFFFFFFF:
-            raise ValueError(f"载荷大小({size})超过最大值(uint32)")
-        
-        buffer.write(struct.pack(">I", size))
-        buffer.write(self.payload)
+    def _set_payload(self, payload: memoryview) -> None:
+        """
+        设置载荷：音频块直接引用原始帧数据，避免逐块拷贝；
+        其余消息（错误、JSON响应等）转为bytes以便打印和解析
+        """
+        self.payload = payload if self.type == MsgType.AudioOnlyServer else bytes(payload)
+
+
+# WebSocket连接池：空闲连接的最长保留时间（秒）及每个事件循环保留的最大空闲连接数
+WS_IDLE_TIMEOUT = 60
+WS_POOL_MAX_IDLE = 4
+
+
+@functools.lru_cache(maxsize=None)
+def _default_ssl_context() -> ssl.SSLContext:
+    """进程内共享的默认SSL上下文"""
+    return ssl.create_default_context()
+
+
+class _WSPool:
+    """
+    WebSocket连接池
+    复用已完成TLS握手与协议升级的连接；每条连接同一时间只服务一次合成请求。
+    连接与创建它的事件循环绑定，因此按事件循环分别保存空闲连接。
+    """
     
-    def _read_event(self, buffer: io.BytesIO) -> None:
-        """读取事件"""
-        event_bytes = buffer.read(4)
-        if event_bytes:
-            self.event = EventType(struct.unpack(">i", event_bytes)[0])
+    def __init__(self, endpoint: str, access_token: str):
+        self.endpoint = endpoint
+        self.headers = {"Authorization": f"Bearer;{access_token}"}
+        parsed_url = urlparse(endpoint)
+        self._host = parsed_url.hostname
+        self._port = parsed_url.port or (443 if parsed_url.scheme == 'wss' else 80)
+        # wss连接共用进程内的SSL上下文，避免每次连接重新加载CA证书
+        self._ssl_context = _default_ssl_context() if parsed_url.scheme == 'wss' else None
+        self._idle: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, deque]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
     
-    def _read_session_id(self, buffer: io.BytesIO) -> None:
-        """读取会话ID"""
-        if self.event in [EventType.StartConnection, EventType.FinishConnection]:
-            return
-        
-        size_bytes = buffer.read(4)
-        if size_bytes:
-            size = struct.unpack(">I", size_bytes)[0]
-            if size > 0:
-                session_id_bytes = buffer.read(size)
-                if len(session_id_bytes) == size:
-                    self.session_id = session_id_bytes.decode("utf-8")
+    def _idle_queue(self) -> deque:
+        """获取当前事件循环的空闲连接队列"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            queue = self._idle.get(loop)
+            if queue is None:
+                queue = self._idle[loop] = deque()
+            return queue
     
-    def _read_connect_id(self, buffer: io.BytesIO) -> None:
-        """读取连接ID"""
-        size_bytes = buffer.read(4)
-        if size_bytes:
-            size = struct.unpack(">I", size_bytes)[0]
-            if size > 0:
-                self.connect_id = buffer.read(size).decode("utf-8")
+    async def connect(self):
+        """建立新连接"""
+        logger.info(f"正在直接连接到 {self._host}:{self._port}")
+        return await websockets.connect(
+            self.endpoint,
+            additional_headers=self.headers,
+            max_size=10 * 1024 * 1024,
+            ssl=self._ssl_context,
+            # 添加连接超时设置
+            open_timeout=30,
+            close_timeout=10,
+            **_direct_connect_kwargs()
+        )
     
-    def _read_sequence(self, buffer: io.BytesIO) -> None:
-        """读取序列号"""
-        sequence_bytes = buffer.read(4)
-        if sequence_bytes:
-            self.sequence = struct.unpack(">i", sequence_bytes)[0]
+    async def acquire(self) -> Tuple[Any, bool]:
+        """
+        获取连接
+        Returns:
+            Tuple[Any, bool]: (连接, 是否为复用的空闲连接)
+        """
+        queue = self._idle_queue()
+        now = time.monotonic()
+        while queue:
+            websocket, last_used = queue.pop()
+            if websocket.close_code is None and now - last_used < WS_IDLE_TIMEOUT:
+                # 顺带关闭更早放回且已超时的连接
+                while queue and now - queue[0][1] >= WS_IDLE_TIMEOUT:
+                    await self.discard(queue.popleft()[0])
+                return websocket, True
+            await self.discard(websocket)
+        return await self.connect(), False
     
-    def _read_error_code(self, buffer: io.BytesIO) -> None:
-        """读取错误码"""
-        error_code_bytes = buffer.read(4)
-        if error_code_bytes:
-            self.error_code = struct.unpack(">I", error_code_bytes)[0]
+    async def release(self, websocket) -> None:
+        """归还完成一次完整请求的连接"""
+        queue = self._idle_queue()
+        if websocket.close_code is None and len(queue) < WS_POOL_MAX_IDLE:
+            queue.append((websocket, time.monotonic()))
+        else:
+            await self.discard(websocket)
     
-    def _read_payload(self, buffer: io.BytesIO) -> None:
-        """读取载荷"""
-        size_bytes = buffer.read(4)
-        if size_bytes:
-            size = struct.unpack(">I", size_bytes)[0]
-            if size > 0:
-                self.payload = buffer.read(size)
+    @staticmethod
+    async def discard(websocket) -> None:
+        """关闭并丢弃连接"""
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def _direct_connect_kwargs() -> Dict[str, Any]:
+    """
+    绕过代理直连所需的websockets.connect参数
+    websockets 15+ 默认读取环境变量中的代理，显式传入proxy=None即可直连，
+    无需修改进程级的环境变量；更早的版本不支持代理，无需额外参数
+    """
+    try:
+        params = inspect.signature(websockets.connect).parameters
+    except (TypeError, ValueError):
+        return {}
+    return {'proxy': None} if 'proxy' in params else {}
+
+
+# 连接池按 (endpoint, access_token) 在进程内共享，配置重新加载后仍可复用连接
+_WS_POOLS: Dict[Tuple[str, str], _WSPool] = {}
+_WS_POOLS_LOCK = threading.Lock()
+
+
+def _get_ws_pool(endpoint: str, access_token: str) -> _WSPool:
+    """获取（或创建）指定端点与令牌的连接池"""
+    key = (endpoint, access_token)
+    with _WS_POOLS_LOCK:
+        pool = _WS_POOLS.get(key)
+        if pool is None:
+            pool = _WS_POOLS[key] = _WSPool(endpoint, access_token)
+        return pool
+
+
+# 同步接口共用的后台事件循环（进程内惰性创建），使连接池中的连接可跨请求复用
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """获取（或启动）后台事件循环线程"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="douyin-tts-loop", daemon=True).start()
+            atexit.register(_loop.call_soon_threadsafe, _loop.stop)
+        return _loop
 
 
 class DouyinTTS(BaseTTS):
     """抖音（火山引擎）语音合成实现类"""
     
+    # 错误码 -> 用户友好的提示（3003配额错误需结合具体配额类型单独处理）
+    _ERR_CODE_RE = re.compile(r"error_code=(\d+)")
+    _ERR_CODE_MAP = {
+        1001: "抖音TTS服务认证失败，请检查API密钥配置",
+        1002: "抖音TTS服务参数错误，请检查语音参数设置",
+        2001: "抖音TTS服务网络连接失败，请检查网络连接",
+    }
+    
     def _validate_config(self) -> None:
         """验证抖音TTS配置信息"""
         required_keys = ['access_token', 'app_id']
@@ -329,6 +534,9 @@ class DouyinTTS(BaseTTS):
         self.endpoint = self.config.get('endpoint', 'wss://openspeech.bytedance.com/api/v1/tts/ws_binary')
         self.cluster = self.config.get('cluster', 'volcano_tts')
         self.default_voice = self.config.get('voice_type', 'zh_male_beijingxiaoye_emo_v2_mars_bigtts')
+        self._ws_pool = _get_ws_pool(self.endpoint, self.access_token)
+        # (voice_type, encoding) -> 预编码的请求JSON片段
+        self._request_templates: Dict[Tuple[str, str], Tuple[bytes, bytes]] = {}
         logger.info(f"豆包TTS客户端初始化成功，app_id: {self.app_id}, 默认发音人: {self.default_voice}")
     
     def synthesize(self, request: TTSRequest) -> TTSResponse:
@@ -357,8 +565,13 @@ class DouyinTTS(BaseTTS):
             if isinstance(data, str):
                 raise ValueError(f"意外的文本消息: {data}")
             elif isinstance(data, bytes):
+                # 音频块走专用解析，其余消息走通用解析
+                audio = parse_audio_only_server(data)
+                if audio is not None:
+                    flag, sequence, payload = audio
+                    return Message(type=MsgType.AudioOnlyServer, flag=flag, sequence=sequence, payload=payload)
                 msg = Message.from_bytes(data)
-                logger.debug(f"接收到消息: {msg.type}")
+                logger.debug("接收到消息: {}", msg.type)
                 return msg
             else:
                 raise ValueError(f"意外的消息类型: {type(data)}")
@@ -375,125 +588,174 @@ class DouyinTTS(BaseTTS):
     
     async def _full_client_request(self, websocket, payload: bytes) -> None:
         """发送完整客户端消息"""
-        msg = Message(type=MsgType.FullClientRequest, flag=MsgTypeFlagBits.NoSeq)
-        msg.payload = payload
-        logger.debug(f"发送消息: {msg.type}")
-        await websocket.send(msg.marshal())
+        await websocket.send(marshal_full_client_request(payload))
+    
+    def _build_request(self, text: str, voice_type: str, encoding: str) -> bytes:
+        """
+        构造合成请求JSON
+        app/audio等固定字段按发音人与编码缓存为预编码片段，每次只拼接uid、reqid和文本
+        """
+        template = self._request_templates.get((voice_type, encoding))
+        if template is None:
+            cluster = "volcano_icl" if voice_type.startswith("S_") else self.cluster
+            app = _json_bytes({"appid": self.app_id, "token": self.access_token, "cluster": cluster})
+            audio = _json_bytes({"voice_type": voice_type, "encoding": encoding})
+            template = (
+                b'{"app":' + app + b',"user":{"uid":"',
+                b'"},"audio":' + audio + b',"request":{"reqid":"',
+            )
+            self._request_templates[(voice_type, encoding)] = template
+        
+        head, middle = template
+        return b"".join([
+            head, str(uuid.uuid4()).encode(),
+            middle, str(uuid.uuid4()).encode(),
+            b'","text":', _json_bytes(text),
+            _REQUEST_TAIL,
+        ])
+    
+    async def _send_request(self, payload: bytes) -> Tuple[Any, Message]:
+        """
+        从连接池获取连接发送请求，并接收第一条响应消息
+        复用的空闲连接可能已被服务端关闭：仅当请求未能发送出去（写入时发现连接已关闭）时
+        才改用新连接重发一次；请求已发出后的失败不重试，避免同一合成被服务端重复处理计费
+        Returns:
+            Tuple[Any, Message]: (连接, 第一条响应消息)
+        """
+        websocket, reused = await self._ws_pool.acquire()
+        try:
+            await self._full_client_request(websocket, payload)
+        except Exception as e:
+            await self._ws_pool.discard(websocket)
+            if not reused:
+                raise
+            logger.debug(f"复用的WebSocket连接已失效，重新连接: {e}")
+        else:
+            try:
+                return websocket, await self._receive_message(websocket)
+            except Exception:
+                await self._ws_pool.discard(websocket)
+                raise
+        
+        websocket = await self._ws_pool.connect()
+        try:
+            await self._full_client_request(websocket, payload)
+            return websocket, await self._receive_message(websocket)
+        except Exception:
+            await self._ws_pool.discard(websocket)
+            raise
+    
+    @staticmethod
+    async def _file_writer(out, queue: asyncio.Queue) -> None:
+        """
+        后台写文件任务：每次取出队列中已到达的全部音频块，在线程中批量写入，
+        使磁盘I/O与WebSocket接收重叠且不阻塞事件循环；收到None时结束
+        """
+        while True:
+            chunk = await queue.get()
+            batch = []
+            while chunk is not None:
+                batch.append(chunk)
+                if queue.empty():
+                    break
+                chunk = queue.get_nowait()
+            if batch:
+                await asyncio.to_thread(out.writelines, batch)
+            if chunk is None:
+                return
     
     async def _tts_synthesize_async(self, text: str, output_file: str = None,
                                    voice_type: str = None, encoding: str = "wav",
                                    stream_callback: Callable = None, 
-                                   session_id: str = None) -> bytes:
-        """异步TTS合成"""
+                                   session_id: str = None,
+                                   stream_writer: Any = None,
+                                   writer_loop: Optional[asyncio.AbstractEventLoop] = None) -> bytes:
+        """
+        异步TTS合成（指定output_file时音频块直接写入文件，返回空bytes）
+        stream_writer为带writelines方法的对象（如asyncio传输或文件），每个音频块以
+        SSE事件的缓冲区列表写入，不拼接成整段字节串。
+        writer_loop为stream_writer所属的事件循环：与合成所用的循环不同时，写入通过
+        call_soon_threadsafe交给该循环执行（asyncio传输/StreamWriter非线程安全）；
+        为None时视为可在任意线程直接调用的对象（如文件）
+        """
         voice_type = voice_type or self.default_voice
-        cluster = "volcano_icl" if voice_type.startswith("S_") else self.cluster
-        headers = {"Authorization": f"Bearer;{self.access_token}"}
         
-        # 禁用所有可能的代理设置
-        proxy_vars = ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy']
-        old_proxy_values = {}
-        
-        # 保存并清除所有代理环境变量
-        for var in proxy_vars:
-            old_proxy_values[var] = os.environ.get(var)
-            if var in os.environ:
-                del os.environ[var]
-
-        logger.info("已禁用所有代理设置进行TTS请求")
-
-        # 临时禁用代理检测函数
-        import urllib.request
-        original_getproxies = urllib.request.getproxies
-        urllib.request.getproxies = lambda: {}
+        write_chunk = None
+        if stream_writer is not None:
+            if writer_loop is None or writer_loop is asyncio.get_running_loop():
+                write_chunk = stream_writer.writelines
+            else:
+                write_chunk = functools.partial(writer_loop.call_soon_threadsafe, stream_writer.writelines)
         
-        # 也禁用socket级别的代理检测
-        original_get_proxy = None
-        try:
-            import httpx._utils
-            original_get_proxy = getattr(httpx._utils, 'get_proxy', None)
-            if original_get_proxy:
-                httpx._utils.get_proxy = lambda *args, **kwargs: None
-        except ImportError:
-            pass
-
+        out = None
+        writer = None
+        audio_data = None
+        websocket = None
+        finished = False
         try:
-            # 完全绕过代理的连接方法
-            from urllib.parse import urlparse
-            
-            # 解析WebSocket URL
-            parsed_url = urlparse(self.endpoint)
-            host = parsed_url.hostname
-            port = parsed_url.port or (443 if parsed_url.scheme == 'wss' else 80)
-            
-            # 创建直接的socket连接，绕过代理
-            logger.info(f"正在直接连接到 {host}:{port}")
-            
-            # 创建SSL上下文（如果需要）
-            ssl_context = None
-            if self.endpoint.startswith('wss://'):
-                ssl_context = ssl.create_default_context()
-            
-            # 使用websockets.connect，但通过禁用代理环境变量来确保直连
-            websocket = await websockets.connect(
-                self.endpoint,
-                additional_headers=headers,
-                max_size=10 * 1024 * 1024,
-                ssl=ssl_context,
-                # 添加连接超时设置
-                open_timeout=30,
-                close_timeout=10
-            )
+            request = self._build_request(text, voice_type, encoding)
+            websocket, pending = await self._send_request(request)
             
-            request = {
-                "app": {"appid": self.app_id, "token": self.access_token, "cluster": cluster},
-                "user": {"uid": str(uuid.uuid4())},
-                "audio": {"voice_type": voice_type, "encoding": encoding},
-                "request": {
-                    "reqid": str(uuid.uuid4()),
-                    "text": text,
-                    "operation": "submit",
-                    "with_timestamp": "1",
-                    "extra_param": json.dumps({"disable_markdown_filter": False}),
-                },
-            }
-            
-            await self._full_client_request(websocket, json.dumps(request).encode())
-            
-            audio_data = bytearray()
+            # 指定输出文件时音频块交给后台写文件任务直接写入磁盘，不在内存中累积
+            if output_file:
+                out = await asyncio.to_thread(open, output_file, "wb", buffering=64 * 1024)
+                write_queue = asyncio.Queue()
+                writer = asyncio.create_task(self._file_writer(out, write_queue))
+            else:
+                # 内存累积时从缓冲区池取出按预估大小预分配的缓冲区，不足时成倍扩容，减少反复realloc拷贝
+                audio_data = _rent_audio_buffer(_estimate_audio_bytes(len(text), encoding))
+            total_size = 0
             chunk_count = 0
             
             while True:
-                try:
-                    msg = await self._receive_message(websocket)
-                except Exception as e:
-                    if "keepalive ping timeout" in str(e) or "no close frame received" in str(e):
-                        logger.info("WebSocket连接因keepalive timeout结束，音频数据接收完成")
-                        break
-                    elif "connection closed" in str(e).lower():
-                        logger.info("WebSocket连接关闭，音频数据接收完成")
-                        break
-                    else:
-                        logger.error(f"接收消息时发生错误: {e}")
-                        raise
+                if pending is not None:
+                    msg, pending = pending, None
+                else:
+                    try:
+                        msg = await self._receive_message(websocket)
+                    except Exception as e:
+                        if "keepalive ping timeout" in str(e) or "no close frame received" in str(e):
+                            logger.info("WebSocket连接因keepalive timeout结束，音频数据接收完成")
+                            break
+                        elif "connection closed" in str(e).lower():
+                            logger.info("WebSocket连接关闭，音频数据接收完成")
+                            break
+                        else:
+                            logger.error(f"接收消息时发生错误: {e}")
+                            raise
                 
                 if msg.type == MsgType.FrontEndResultServer:
                     continue
                 elif msg.type == MsgType.AudioOnlyServer:
                     chunk_data = msg.payload
-                    audio_data.extend(chunk_data)
+                    end = total_size + len(chunk_data)
+                    if out:
+                        write_queue.put_nowait(chunk_data)
+                    else:
+                        if end > len(audio_data):
+                            audio_data += bytes(max(len(audio_data), end - len(audio_data)))
+                        audio_data[total_size:end] = chunk_data
+                    total_size = end
                     chunk_count += 1
                     
                     # 流式回调
                     if stream_callback and session_id and len(chunk_data) > 0:
-                        chunk_base64 = base64.b64encode(chunk_data).decode('utf-8')
+                        chunk_base64 = binascii.b2a_base64(chunk_data, newline=False).decode('ascii')
                         stream_callback(
                             session_id, 'tts_stream',
                             chunk_base64,
                             chunk_count=chunk_count,
-                            total_size=len(audio_data),
+                            total_size=total_size,
                             is_final=(msg.sequence < 0)
                         )
-                        logger.debug(f"🔊 TTS流式输出第{chunk_count}块，大小: {len(chunk_data)} bytes")
+                        logger.debug("🔊 TTS流式输出第{}块，大小: {} bytes", chunk_count, len(chunk_data))
+                    
+                    if write_chunk is not None and len(chunk_data) > 0:
+                        write_chunk([
+                            _SSE_CHUNK_PREFIX,
+                            binascii.b2a_base64(chunk_data, newline=False),
+                            _SSE_CHUNK_SUFFIX % (chunk_count, total_size, b"true" if msg.sequence < 0 else b"false"),
+                        ])
                     
                     if msg.sequence < 0:
                         # 发送完成信号
@@ -502,45 +764,48 @@ class DouyinTTS(BaseTTS):
                                 session_id, 'tts_stream_complete',
                                 f"TTS合成完成，共{chunk_count}块音频数据",
                                 chunk_count=chunk_count,
-                                total_size=len(audio_data),
+                                total_size=total_size,
                                 is_final=True
                             )
+                        finished = True
                         break
                 else:
                     raise RuntimeError(f"TTS转换失败: {msg}")
             
-            if not audio_data:
+            if not total_size:
                 raise RuntimeError("未接收到音频数据")
             
-            if output_file:
-                with open(output_file, "wb") as f:
-                    f.write(audio_data)
-            
-            return bytes(audio_data)
+            if out:
+                write_queue.put_nowait(None)
+                await writer
+                await asyncio.to_thread(out.close)
+                return b""
+            with memoryview(audio_data) as view:
+                return bytes(view[:total_size])
             
         except Exception as e:
             logger.error(f"TTS请求失败: {str(e)}")
+            # 等待写文件任务结束后删除未写完的输出文件
+            if out:
+                if not writer.done():
+                    write_queue.put_nowait(None)
+                await asyncio.gather(writer, return_exceptions=True)
+                out.close()
+                try:
+                    os.unlink(output_file)
+                except OSError:
+                    pass
             raise
         finally:
-            try:
-                await websocket.close()
-            except:
-                pass
-
-            # 恢复原来的代理设置
-            for var, old_value in old_proxy_values.items():
-                if old_value is not None:
-                    os.environ[var] = old_value
+            if audio_data is not None:
+                _return_audio_buffer(audio_data)
             
-            # 恢复代理检测函数
-            urllib.request.getproxies = original_getproxies
-            try:
-                if original_get_proxy:
-                    httpx._utils.get_proxy = original_get_proxy
-            except (NameError, ImportError):
-                pass
-
-            logger.info("已恢复代理设置")
+            # 完整收到结束包的连接放回连接池，其余情况直接关闭
+            if websocket is not None:
+                if finished:
+                    await self._ws_pool.release(websocket)
+                else:
+                    await self._ws_pool.discard(websocket)
     
     def synthesize_text(self,
                        text: str,
@@ -566,32 +831,20 @@ class DouyinTTS(BaseTTS):
             TTSResponse: 合成结果
         """
         try:
-            # 在新的事件循环中运行异步函数
-            import concurrent.futures
-            
-            def run_async():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    return loop.run_until_complete(self._tts_synthesize_async(
-                        text=text,
-                        output_file=output_file,
-                        voice_type=voice,
-                        encoding=audio_format
-                    ))
-                finally:
-                    loop.close()
-            
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(run_async)
-                audio_data = future.result()
+            # 在共用的后台事件循环中运行异步函数
+            audio_data = asyncio.run_coroutine_threadsafe(self._tts_synthesize_async(
+                text=text,
+                output_file=output_file,
+                voice_type=voice,
+                encoding=audio_format
+            ), _get_loop()).result()
             
             return TTSResponse(
                 text=text,
                 success=True,
                 audio_file=output_file,
-                audio_data=audio_data,
-                file_size=len(audio_data),
+                audio_data=audio_data or None,
+                file_size=os.path.getsize(output_file) if output_file else len(audio_data),
                 duration=0,  # TODO: 计算实际时长
                 extra_info={
                     'format': audio_format,
@@ -618,7 +871,9 @@ class DouyinTTS(BaseTTS):
                               language: str = 'zh',
                               audio_format: str = 'wav',
                               stream_callback: Callable = None,
-                              session_id: str = None) -> TTSResponse:
+                              session_id: str = None,
+                              stream_writer: Any = None,
+                              writer_loop: Optional[asyncio.AbstractEventLoop] = None) -> TTSResponse:
         """
         执行流式抖音语音合成
         Args:
@@ -631,30 +886,23 @@ class DouyinTTS(BaseTTS):
             audio_format: 音频格式
             stream_callback: 流式回调函数
             session_id: 会话ID
+            stream_writer: 可选的writelines输出对象，音频块以SSE事件缓冲区列表写入
+            writer_loop: stream_writer所属的事件循环（asyncio传输/StreamWriter必须传入），
+                合成在后台事件循环中进行，写入会转交给该循环执行
         Returns:
             TTSResponse: 合成结果
         """
         try:
-            # 在新的事件循环中运行异步函数
-            import concurrent.futures
-            
-            def run_async():
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    return loop.run_until_complete(self._tts_synthesize_async(
-                        text=text,
-                        voice_type=voice,
-                        encoding=audio_format,
-                        stream_callback=stream_callback,
-                        session_id=session_id
-                    ))
-                finally:
-                    loop.close()
-            
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(run_async)
-                audio_data = future.result()
+            # 在共用的后台事件循环中运行异步函数
+            audio_data = asyncio.run_coroutine_threadsafe(self._tts_synthesize_async(
+                text=text,
+                voice_type=voice,
+                encoding=audio_format,
+                stream_callback=stream_callback,
+                session_id=session_id,
+                stream_writer=stream_writer,
+                writer_loop=writer_loop
+            ), _get_loop()).result()
             
             return TTSResponse(
                 text=text,
@@ -707,26 +955,25 @@ class DouyinTTS(BaseTTS):
         error_str = str(error)
         
         # 检查是否包含错误代码和消息
-        if "error_code=3003" in error_str and "quota exceeded" in error_str:
+        match = self._ERR_CODE_RE.search(error_str)
+        code = int(match.group(1)) if match else None
+        if code == 3003 and "quota exceeded" in error_str:
             if "text_words_lifetime" in error_str:
                 return "抖音TTS服务配额已用完，请联系管理员充值或切换到其他TTS服务商"
             elif "text_words_daily" in error_str:
                 return "抖音TTS服务今日配额已用完，请明天再试或切换到其他TTS服务商"
             else:
                 return "抖音TTS服务配额不足，请联系管理员处理"
+        if code in self._ERR_CODE_MAP:
+            return self._ERR_CODE_MAP[code]
         
         # 检查其他常见错误
-        if "error_code=1001" in error_str:
-            return "抖音TTS服务认证失败，请检查API密钥配置"
-        elif "error_code=1002" in error_str:
-            return "抖音TTS服务参数错误，请检查语音参数设置"
-        elif "error_code=2001" in error_str:
-            return "抖音TTS服务网络连接失败，请检查网络连接"
-        elif "connection" in error_str.lower() and "timeout" in error_str.lower():
+        lower = error_str.lower()
+        if "connection" in lower and "timeout" in lower:
             return "抖音TTS服务连接超时，请稍后重试"
-        elif "websocket" in error_str.lower():
+        elif "websocket" in lower:
             return "抖音TTS服务连接异常，请稍后重试"
-        elif "invalid" in error_str.lower() and "token" in error_str.lower():
+        elif "invalid" in lower and "token" in lower:
             return "抖音TTS服务访问令牌无效，请检查配置"
         
         # 如果无法识别具体错误，返回通用消息
@@ -4,13 +4,11 @@
 import time
 import os
 import tempfile
-import logging
+from loguru import logger
 from typing import Dict, Any, List
 from .tts_base import BaseTTS
 from .tts_models import TTSRequest, TTSResponse
 
-logger = logging.getLogger(__name__)
-
 
 class TencentTTS(BaseTTS):
     """腾讯云语音合成实现类"""
@@ -1,14 +1,22 @@
 """
 TTS文本转语音服务的抽象基类
 """
+import os
+import tempfile
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from .tts_models import TTSRequest, TTSResponse
 
+# 合成过程中的临时音频文件优先放在内存文件系统(tmpfs)上，读回时不产生磁盘IO
+TEMP_AUDIO_DIR = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
 
 class BaseTTS(ABC):
     """TTS文本转语音基础抽象类"""
     
+    # 实现自身带有合成结果缓存时设为True，TTS管理器不再重复缓存其结果
+    caches_results: bool = False
+    
     def __init__(self, config: Dict[str, Any]):
         """
         初始化TTS实例
@@ -66,6 +74,42 @@ class BaseTTS(ABC):
         """
         pass
     
+    def synthesize_bytes(self, request: TTSRequest) -> Tuple[bytes, TTSResponse]:
+        """
+        合成文本为内存中的音频数据，不保留文件
+        默认实现合成到临时文件后读回，能直接在内存中得到音频的实现应覆盖此方法
+        Args:
+            request: TTS请求参数（忽略 output_file）
+        Returns:
+            Tuple[bytes, TTSResponse]: (音频数据, 合成结果)，失败时音频数据为空
+        """
+        fd, temp_file = tempfile.mkstemp(suffix=f".{(request.audio_format or 'wav').lower()}",
+                                         dir=TEMP_AUDIO_DIR)
+        os.close(fd)
+        try:
+            response = self.synthesize_text(
+                text=request.text,
+                output_file=temp_file,
+                voice=request.voice,
+                speed=request.speed,
+                pitch=request.pitch,
+                volume=request.volume,
+                language=request.language,
+                audio_format=request.audio_format
+            )
+            audio_data = b''
+            if response.success and os.path.exists(temp_file):
+                with open(temp_file, 'rb') as f:
+                    audio_data = f.read()
+                response.audio_data = audio_data
+                response.file_size = len(audio_data)
+            return audio_data, response
+        finally:
+            try:
+                os.unlink(temp_file)
+            except OSError:
+                pass
+    
     def get_supported_voices(self) -> List[Dict[str, Any]]:
         """获取支持的发音人列表"""
         return []
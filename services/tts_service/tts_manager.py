@@ -2,31 +2,174 @@
 TTS文本转语音服务管理器
 """
 import os
+import copy
+import shutil
 import tempfile
 import logging
-from typing import Dict, Any, List, Optional
+import importlib
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Iterator
 from .tts_models import TTSRequest, TTSResponse
-from .baidu_tts import BaiduTTS
-from .xunfei_tts import XunfeiTTS
-from .douyin_tts import DouyinTTS
-from .aliyun_tts import AliyunTTS
-from .tencent_tts import TencentTTS
+from .tts_base import TEMP_AUDIO_DIR
+from ._audio_cache import AudioCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_CACHE_BYTES
 
 logger = logging.getLogger(__name__)
 
+# 音频格式对应的文件扩展名
+_EXT_MAP = {
+    'wav': '.wav',
+    'mp3': '.mp3',
+    'pcm': '.pcm'
+}
+
+
+# 并发合成线程池的线程数
+SYNTHESIS_MAX_WORKERS = 16
+# 每个提供商默认的最大并发请求数，可通过 TTS_{提供商}_CONCURRENCY 环境变量覆盖
+DEFAULT_PROVIDER_CONCURRENCY = 3
+
+# 不支持 sendfile 的平台上回退复制时的块大小
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+def _sendfile(out_fd: int, path: str) -> int:
+    """
+    将文件内容完整写入输出描述符，返回写出的字节数
+    优先使用 os.sendfile 在内核中完成拷贝，不支持时回退为分块读写
+    """
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        offset = 0
+        if hasattr(os, 'sendfile'):
+            while offset < size:
+                sent = os.sendfile(out_fd, f.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return offset
+        
+        while True:
+            chunk = f.read(_COPY_CHUNK_SIZE)
+            if not chunk:
+                return offset
+            with memoryview(chunk) as view:
+                written = 0
+                while written < len(view):
+                    written += os.write(out_fd, view[written:])
+            offset += written
+
+
+# 各提供商的关键API密钥字段
+_REQUIRED_KEYS = {
+    'baidu': ('app_id', 'api_key', 'secret_key'),
+    'xunfei': ('app_id', 'api_key', 'api_secret'),
+    'douyin': ('access_token', 'app_id'),
+    'aliyun': ('access_key_id', 'access_key_secret', 'app_key'),
+    'tencent': ('secret_id', 'secret_key'),
+}
+
+# 各提供商的静态信息（实例可用时以实例报告的信息覆盖）
+_PROVIDER_INFO_STATIC = {
+    'baidu': {
+        'name': '百度语音合成',
+        'description': '百度AI开放平台语音合成服务',
+        'supported_formats': ['mp3'],
+        'supported_languages': ['zh'],
+        'supported_voices': [
+            {'id': 'female', 'name': '度小美', 'gender': 'female'},
+            {'id': 'male', 'name': '度小宇', 'gender': 'male'},
+            {'id': 'duyaya', 'name': '度逍遥', 'gender': 'male'},
+            {'id': 'duyanyan', 'name': '度丫丫', 'gender': 'female', 'age': 'child'},
+        ]
+    },
+    'xunfei': {
+        'name': '讯飞语音合成',
+        'description': '科大讯飞语音合成服务',
+        'supported_formats': ['wav', 'mp3'],
+        'supported_languages': ['zh', 'en'],
+        'supported_voices': [
+            {'id': 'female', 'name': '叶子', 'gender': 'female'},
+            {'id': 'male', 'name': '凌风', 'gender': 'male'},
+            {'id': 'xiaoyan', 'name': '小燕', 'gender': 'female'},
+            {'id': 'xiaoyu', 'name': '小宇', 'gender': 'male'},
+        ]
+    },
+    'aliyun': {
+        'name': '阿里云语音合成',
+        'description': '阿里云智能语音合成服务',
+        'supported_formats': ['wav', 'mp3'],
+        'supported_languages': ['zh', 'en'],
+        'supported_voices': [
+            {'id': 'Xiaoyun', 'name': '小云', 'gender': 'female', 'language': 'zh'},
+            {'id': 'Xiaogang', 'name': '小刚', 'gender': 'male', 'language': 'zh'},
+            {'id': 'Ruoxi', 'name': '若汐', 'gender': 'female', 'language': 'zh'},
+            {'id': 'Siqi', 'name': '思琪', 'gender': 'female', 'language': 'zh'},
+        ]
+    },
+    'tencent': {
+        'name': '腾讯云语音合成',
+        'description': '腾讯云语音合成服务',
+        'supported_formats': ['wav', 'mp3'],
+        'supported_languages': ['zh', 'en'],
+        'supported_voices': [
+            {'id': '101001', 'name': '智瑜', 'gender': 'female', 'language': 'zh'},
+            {'id': '101002', 'name': '智聆', 'gender': 'female', 'language': 'zh'},
+            {'id': '101003', 'name': '智美', 'gender': 'female', 'language': 'zh'},
+            {'id': '101004', 'name': '智云', 'gender': 'male', 'language': 'zh'},
+            {'id': '101005', 'name': '智莉', 'gender': 'female', 'language': 'zh'},
+        ]
+    },
+    'douyin': {
+        'name': '抖音语音合成',
+        'description': '字节跳动火山引擎语音合成服务',
+        'supported_formats': ['wav', 'mp3'],
+        'supported_languages': ['zh', 'en'],
+        'supported_voices': [
+            {'id': 'zh_male_beijingxiaoye_emo_v2_mars_bigtts', 'name': '北京小爷', 'gender': 'male', 'language': 'zh'},
+            {'id': 'zh_female_xiaoxin_emo_v2_mars_bigtts', 'name': '小欣', 'gender': 'female', 'language': 'zh'},
+            {'id': 'zh_male_xiaofeng_emo_v2_mars_bigtts', 'name': '小峰', 'gender': 'male', 'language': 'zh'},
+            {'id': 'zh_female_xiaoli_emo_v2_mars_bigtts', 'name': '小丽', 'gender': 'female', 'language': 'zh'},
+            {'id': 'zh_male_dongbeixiaogang_emo_v2_mars_bigtts', 'name': '东北小刚', 'gender': 'male', 'language': 'zh'},
+        ]
+    }
+}
+
 
 class TTSManager:
     """TTS管理器，负责管理所有TTS实例"""
     
     def __init__(self):
         self.tts_instances: Dict[str, Any] = {}
+        # 提供商实现按需导入：(模块名, 类名)，未配置的提供商不会加载其模块及依赖
         self.tts_classes = {
-            'baidu': BaiduTTS,
-            'xunfei': XunfeiTTS,
-            'douyin': DouyinTTS,
-            'aliyun': AliyunTTS,
-            'tencent': TencentTTS,
+            'baidu': ('.baidu_tts', 'BaiduTTS'),
+            'xunfei': ('.xunfei_tts', 'XunfeiTTS'),
+            'douyin': ('.douyin_tts', 'DouyinTTS'),
+            'aliyun': ('.aliyun_tts', 'AliyunTTS'),
+            'tencent': ('.tencent_tts', 'TencentTTS'),
+        }
+        # 共享的合成线程池，每个提供商的并发数由各自的信号量限制
+        self._executor = ThreadPoolExecutor(max_workers=SYNTHESIS_MAX_WORKERS,
+                                            thread_name_prefix='tts')
+        self._semaphores = {
+            provider: threading.Semaphore(int(os.getenv(f'TTS_{provider.upper()}_CONCURRENCY',
+                                                        DEFAULT_PROVIDER_CONCURRENCY)))
+            for provider in self.tts_classes
         }
+        # 各提供商配置的指纹，作为合成结果缓存键的一部分
+        self._config_fingerprints: Dict[str, str] = {}
+        # 提供商信息缓存，键为 (提供商, 实例集合版本)
+        self._cache_version = 0
+        self._provider_info_cache: Dict[tuple, Dict[str, Any]] = {}
+        # 合成结果缓存，相同参数的重复请求直接复用已合成的音频
+        self._cache_dir = os.getenv('TTS_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.max_cache_bytes = int(os.getenv('TTS_CACHE_MAX_BYTES', DEFAULT_MAX_CACHE_BYTES))
+        try:
+            self._audio_cache: Optional[AudioCache] = AudioCache(self._cache_dir, self.max_cache_bytes)
+        except OSError as e:
+            logger.warning(f"初始化TTS缓存失败，将不使用缓存: {e}")
+            self._audio_cache = None
     
     def initialize_tts_services(self, config: Dict[str, Any]) -> None:
         """
@@ -35,19 +178,27 @@ class TTSManager:
             config: TTS配置字典
         """
         self.tts_instances.clear()
+        # 实例集合变化，已缓存的提供商信息失效
+        self._cache_version += 1
+        self._provider_info_cache.clear()
+        self._config_fingerprints.clear()
         
         for provider, provider_config in config.items():
-            if provider in self.tts_classes and self._is_config_valid(provider_config):
+            if provider in self.tts_classes and self._is_config_valid(provider, provider_config):
                 try:
-                    self.tts_instances[provider] = self.tts_classes[provider](provider_config)
+                    module_name, class_name = self.tts_classes[provider]
+                    tts_class = getattr(importlib.import_module(module_name, __package__), class_name)
+                    self.tts_instances[provider] = tts_class(provider_config)
+                    self._config_fingerprints[provider] = AudioCache.config_fingerprint(provider_config)
                     logger.info(f"成功初始化 {provider} TTS")
                 except Exception as e:
                     logger.error(f"初始化 {provider} TTS 失败: {e}")
     
-    def _is_config_valid(self, config: Dict[str, Any]) -> bool:
+    def _is_config_valid(self, provider: str, config: Dict[str, Any]) -> bool:
         """
         检查配置是否有效
         Args:
+            provider: 提供商名称
             config: 配置字典
         Returns:
             bool: 配置是否有效
@@ -55,27 +206,9 @@ class TTSManager:
         if not config or not isinstance(config, dict):
             return False
         
-        # 检查关键API密钥字段是否存在且非空
-        key_fields = {
-            'baidu': ['app_id', 'api_key', 'secret_key'],
-            'xunfei': ['app_id', 'api_key', 'api_secret'],
-            'douyin': ['access_token', 'app_id'],
-            'aliyun': ['access_key_id', 'access_key_secret', 'app_key'],
-            'tencent': ['secret_id', 'secret_key']
-        }
-        
-        # 通过检查是否有至少一个关键字段有值来判断配置是否有效
-        # 这比检查所有字段更宽松，但比只检查任意非空值更严格
-        has_key_field = False
-        for key_list in key_fields.values():
-            for key in key_list:
-                if key in config and config[key] and str(config[key]).strip():
-                    has_key_field = True
-                    break
-            if has_key_field:
-                break
-                
-        return has_key_field
+        # 该提供商至少有一个关键API密钥字段存在且非空
+        return any(config.get(key) and str(config[key]).strip()
+                   for key in _REQUIRED_KEYS.get(provider, ()))
     
     def get_available_providers(self) -> List[str]:
         """
@@ -117,9 +250,19 @@ class TTSManager:
                 error_msg=f'提供商 {provider} 未配置或不可用'
             )
         
+        cache_key = self._result_cache_key(provider, text, voice, speed, pitch, volume,
+                                           language, audio_format)
+        if cache_key is not None:
+            cached = self._audio_cache.lookup(cache_key)
+            if cached is not None:
+                try:
+                    return self._cached_response(text, *cached, output_file=output_file)
+                except OSError as e:
+                    logger.warning(f"读取TTS缓存失败: {e}")
+        
         try:
             tts_instance = self.tts_instances[provider]
-            return tts_instance.synthesize_text(
+            result = tts_instance.synthesize_text(
                 text=text,
                 output_file=output_file,
                 voice=voice,
@@ -129,6 +272,11 @@ class TTSManager:
                 language=language,
                 audio_format=audio_format
             )
+            if cache_key is not None and result.success:
+                ext = _EXT_MAP.get((audio_format or '').lower(), '.wav')
+                self._audio_cache.put(cache_key, ext, result.audio_file, result.audio_data,
+                                      metadata=self._cache_metadata(result))
+            return result
         except Exception as e:
             logger.error(f"调用 {provider} TTS 失败: {e}")
             return TTSResponse(
@@ -137,6 +285,99 @@ class TTSManager:
                 error_msg=str(e)
             )
     
+    def _result_cache_key(self, provider: str, text: str, voice: Optional[str], speed: float,
+                          pitch: float, volume: float, language: str, audio_format: str) -> Optional[str]:
+        """
+        计算合成结果缓存键，包含提供商配置指纹（未指定发音人时使用配置中的默认发音人/格式）
+        缓存关闭、文本为空或提供商自行缓存合成结果（caches_results）时返回None，
+        由提供商的缓存负责，避免同一音频在磁盘上缓存两份
+        """
+        if self._audio_cache is None or not text or text.isspace():
+            return None
+        if self.tts_instances[provider].caches_results:
+            return None
+        return AudioCache.make_key(provider, text, voice, speed, pitch, volume,
+                                   language, audio_format, self._config_fingerprints.get(provider, ''))
+    
+    @staticmethod
+    def _cache_metadata(result: TTSResponse) -> Dict[str, Any]:
+        """随缓存条目保存的合成结果信息，命中缓存时原样恢复"""
+        return {'audio_length': result.audio_length, 'duration': result.duration}
+    
+    @staticmethod
+    def _cached_response(text: str, cached_path: str, metadata: Dict[str, Any],
+                         output_file: str = None) -> TTSResponse:
+        """
+        根据缓存文件构造合成结果
+        指定输出文件时复制缓存文件，否则直接返回音频数据
+        """
+        if output_file:
+            shutil.copyfile(cached_path, output_file)
+            return TTSResponse(
+                text=text,
+                audio_file=output_file,
+                success=True,
+                file_size=os.path.getsize(output_file),
+                **metadata
+            )
+        
+        with open(cached_path, 'rb') as f:
+            audio_data = f.read()
+        return TTSResponse(
+            text=text,
+            audio_data=audio_data,
+            success=True,
+            file_size=len(audio_data),
+            **metadata
+        )
+    
+    def _run_with_semaphore(self, provider: str, func, /, *args, **kwargs):
+        """在提供商的并发信号量内执行合成调用"""
+        semaphore = self._semaphores.get(provider)
+        if semaphore is None:
+            return func(*args, **kwargs)
+        with semaphore:
+            return func(*args, **kwargs)
+    
+    def synthesize_text_async(self,
+                              provider: str,
+                              text: str,
+                              output_file: str = None,
+                              voice: str = None,
+                              speed: float = 1.0,
+                              pitch: float = 1.0,
+                              volume: float = 1.0,
+                              language: str = 'zh',
+                              audio_format: str = 'wav') -> Future:
+        """
+        在共享线程池中合成文本，立即返回Future
+        多个调用方可并行合成，单个提供商的并发数不超过其信号量上限
+        Args:
+            provider: TTS提供商
+            text: 要合成的文本
+            output_file: 输出文件路径
+            voice: 发音人
+            speed: 语速
+            pitch: 音调
+            volume: 音量
+            language: 语言
+            audio_format: 音频格式
+        Returns:
+            Future: 完成后得到 TTSResponse
+        """
+        return self._executor.submit(
+            self._run_with_semaphore, provider, self.synthesize_text,
+            provider=provider,
+            text=text,
+            output_file=output_file,
+            voice=voice,
+            speed=speed,
+            pitch=pitch,
+            volume=volume,
+            language=language,
+            audio_format=audio_format
+        )
+    
     def synthesize_to_memory(self,
                            provider: str,
                            text: str,
@@ -160,22 +401,97 @@ class TTSManager:
         Returns:
             TTSResponse: 合成结果
         """
-        # 创建临时文件
-        temp_file = None
+        if provider not in self.tts_instances:
+            return TTSResponse(
+                text=text,
+                success=False,
+                error_msg=f'提供商 {provider} 未配置或不可用'
+            )
+        
+        # 缓存命中时直接读取缓存文件
+        cache_key = self._result_cache_key(provider, text, voice, speed, pitch, volume,
+                                           language, audio_format)
+        if cache_key is not None:
+            cached = self._audio_cache.lookup(cache_key)
+            if cached is not None:
+                try:
+                    return self._cached_response(text, *cached)
+                except OSError as e:
+                    logger.warning(f"读取TTS缓存失败: {e}")
+        
         try:
-            # 确定文件扩展名
-            ext_map = {
-                'wav': '.wav',
-                'mp3': '.mp3',
-                'pcm': '.pcm'
-            }
-            ext = ext_map.get(audio_format.lower(), '.wav')
-            
-            # 创建临时文件
-            with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as f:
-                temp_file = f.name
+            request = TTSRequest(
+                text=text,
+                voice=voice,
+                speed=speed,
+                pitch=pitch,
+                volume=volume,
+                language=language,
+                audio_format=audio_format
+            )
+            # 由提供商直接返回内存中的音频，不支持的提供商在基类中回退为临时文件
+            audio_data, result = self.tts_instances[provider].synthesize_bytes(request)
+            if cache_key is not None and result.success and audio_data:
+                self._audio_cache.put(cache_key, _EXT_MAP.get(audio_format.lower(), '.wav'),
+                                      audio_data=audio_data, metadata=self._cache_metadata(result))
+            return result
             
-            # 执行合成
+        except Exception as e:
+            logger.error(f"内存合成失败: {e}")
+            return TTSResponse(
+                text=text,
+                success=False,
+                error_msg=str(e)
+            )
+    
+    def stream_to_fd(self,
+                     provider: str,
+                     text: str,
+                     out_fd: int,
+                     voice: str = None,
+                     speed: float = 1.0,
+                     pitch: float = 1.0,
+                     volume: float = 1.0,
+                     language: str = 'zh',
+                     audio_format: str = 'wav') -> TTSResponse:
+        """
+        合成文本并将音频直接写入文件描述符（如阻塞模式的socket）
+        缓存命中时由内核通过 sendfile 直接从缓存文件拷贝，音频数据不经过用户态
+        Args:
+            provider: TTS提供商
+            text: 要合成的文本
+            out_fd: 输出文件描述符
+            voice: 发音人
+            speed: 语速
+            pitch: 音调
+            volume: 音量
+            language: 语言
+            audio_format: 音频格式
+        Returns:
+            TTSResponse: 合成结果（不含音频数据），file_size 为写出的字节数
+        """
+        if provider not in self.tts_instances:
+            return TTSResponse(
+                text=text,
+                success=False,
+                error_msg=f'提供商 {provider} 未配置或不可用'
+            )
+        
+        cache_key = self._result_cache_key(provider, text, voice, speed, pitch, volume,
+                                           language, audio_format)
+        if cache_key is not None:
+            cached_path = self._audio_cache.get(cache_key)
+            if cached_path is not None:
+                try:
+                    return TTSResponse(text=text, success=True,
+                                       file_size=_sendfile(out_fd, cached_path))
+                except OSError as e:
+                    logger.warning(f"发送TTS缓存文件失败: {e}")
+        
+        fd, temp_file = tempfile.mkstemp(suffix=_EXT_MAP.get(audio_format.lower(), '.wav'),
+                                         dir=TEMP_AUDIO_DIR)
+        os.close(fd)
+        try:
             result = self.synthesize_text(
                 provider=provider,
                 text=text,
@@ -187,29 +503,62 @@ class TTSManager:
                 language=language,
                 audio_format=audio_format
             )
-            
-            # 如果成功，读取文件内容到内存
-            if result.success and os.path.exists(temp_file):
-                with open(temp_file, 'rb') as f:
-                    result.audio_data = f.read()
-                result.file_size = len(result.audio_data)
-            
+            if result.success:
+                result.file_size = _sendfile(out_fd, temp_file)
+                result.audio_file = ""
+                result.audio_data = None
             return result
-            
         except Exception as e:
-            logger.error(f"内存合成失败: {e}")
+            logger.error(f"流式写出合成音频失败: {e}")
             return TTSResponse(
                 text=text,
                 success=False,
                 error_msg=str(e)
             )
         finally:
-            # 清理临时文件
-            if temp_file and os.path.exists(temp_file):
-                try:
-                    os.unlink(temp_file)
-                except Exception as e:
-                    logger.warning(f"删除临时文件失败: {e}")
+            try:
+                os.unlink(temp_file)
+            except OSError:
+                pass
+    
+    def synthesize_audio_stream(self,
+                                provider: str,
+                                text: str,
+                                voice: str = None,
+                                speed: float = 1.0,
+                                pitch: float = 1.0,
+                                volume: float = 1.0,
+                                language: str = 'zh') -> Iterator[bytes]:
+        """
+        以数据块形式流式返回合成的音频（适用于HTTP分块传输）
+        Args:
+            provider: TTS提供商
+            text: 要合成的文本
+            voice: 发音人
+            speed: 语速
+            pitch: 音调
+            volume: 音量
+            language: 语言
+        Returns:
+            Iterator[bytes]: 音频数据块迭代器
+        """
+        if provider not in self.tts_instances:
+            raise ValueError(f'提供商 {provider} 未配置或不可用')
+        
+        tts_instance = self.tts_instances[provider]
+        if not hasattr(tts_instance, 'synthesize_stream'):
+            raise ValueError(f'提供商 {provider} 不支持音频流式输出')
+        
+        request = TTSRequest(
+            text=text,
+            voice=voice,
+            speed=speed,
+            pitch=pitch,
+            volume=volume,
+            language=language,
+            audio_format='mp3'
+        )
+        return tts_instance.synthesize_stream(request)
     
     def get_provider_info(self, provider: str) -> Dict[str, Any]:
         """
@@ -219,72 +568,13 @@ class TTSManager:
         Returns:
             Dict[str, Any]: 提供商信息
         """
-        provider_info = {
-            'baidu': {
-                'name': '百度语音合成',
-                'description': '百度AI开放平台语音合成服务',
-                'supported_formats': ['mp3'],
-                'supported_languages': ['zh'],
-                'supported_voices': [
-                    {'id': 'female', 'name': '度小美', 'gender': 'female'},
-                    {'id': 'male', 'name': '度小宇', 'gender': 'male'},
-                    {'id': 'duyaya', 'name': '度逍遥', 'gender': 'male'},
-                    {'id': 'duyanyan', 'name': '度丫丫', 'gender': 'female', 'age': 'child'},
-                ]
-            },
-            'xunfei': {
-                'name': '讯飞语音合成',
-                'description': '科大讯飞语音合成服务',
-                'supported_formats': ['wav', 'mp3'],
-                'supported_languages': ['zh', 'en'],
-                'supported_voices': [
-                    {'id': 'female', 'name': '叶子', 'gender': 'female'},
-                    {'id': 'male', 'name': '凌风', 'gender': 'male'},
-                    {'id': 'xiaoyan', 'name': '小燕', 'gender': 'female'},
-                    {'id': 'xiaoyu', 'name': '小宇', 'gender': 'male'},
-                ]
-            },
-            'aliyun': {
-                'name': '阿里云语音合成',
-                'description': '阿里云智能语音合成服务',
-                'supported_formats': ['wav', 'mp3'],
-                'supported_languages': ['zh', 'en'],
-                'supported_voices': [
-                    {'id': 'Xiaoyun', 'name': '小云', 'gender': 'female', 'language': 'zh'},
-                    {'id': 'Xiaogang', 'name': '小刚', 'gender': 'male', 'language': 'zh'},
-                    {'id': 'Ruoxi', 'name': '若汐', 'gender': 'female', 'language': 'zh'},
-                    {'id': 'Siqi', 'name': '思琪', 'gender': 'female', 'language': 'zh'},
-                ]
-            },
-            'tencent': {
-                'name': '腾讯云语音合成',
-                'description': '腾讯云语音合成服务',
-                'supported_formats': ['wav', 'mp3'],
-                'supported_languages': ['zh', 'en'],
-                'supported_voices': [
-                    {'id': '101001', 'name': '智瑜', 'gender': 'female', 'language': 'zh'},
-                    {'id': '101002', 'name': '智聆', 'gender': 'female', 'language': 'zh'},
-                    {'id': '101003', 'name': '智美', 'gender': 'female', 'language': 'zh'},
-                    {'id': '101004', 'name': '智云', 'gender': 'male', 'language': 'zh'},
-                    {'id': '101005', 'name': '智莉', 'gender': 'female', 'language': 'zh'},
-                ]
-            },
-            'douyin': {
-                'name': '抖音语音合成',
-                'description': '字节跳动火山引擎语音合成服务',
-                'supported_formats': ['wav', 'mp3'],
-                'supported_languages': ['zh', 'en'],
-                'supported_voices': [
-                    {'id': 'zh_male_beijingxiaoye_emo_v2_mars_bigtts', 'name': '北京小爷', 'gender': 'male', 'language': 'zh'},
-                    {'id': 'zh_female_xiaoxin_emo_v2_mars_bigtts', 'name': '小欣', 'gender': 'female', 'language': 'zh'},
-                    {'id': 'zh_male_xiaofeng_emo_v2_mars_bigtts', 'name': '小峰', 'gender': 'male', 'language': 'zh'},
-                    {'id': 'zh_female_xiaoli_emo_v2_mars_bigtts', 'name': '小丽', 'gender': 'female', 'language': 'zh'},
-                    {'id': 'zh_male_dongbeixiaogang_emo_v2_mars_bigtts', 'name': '东北小刚', 'gender': 'male', 'language': 'zh'},
-                ]
-            }
-        }
+        cache_key = (provider, self._cache_version)
+        cached = self._provider_info_cache.get(cache_key)
+        if cached is not None:
+            # 返回副本，避免调用方修改缓存中的发音人/格式列表
+            return copy.deepcopy(cached)
         
-        info = provider_info.get(provider, {})
+        info = dict(_PROVIDER_INFO_STATIC.get(provider, {}))
         info['available'] = provider in self.tts_instances
         
         # 如果实例可用，获取实际支持的信息
@@ -297,7 +587,8 @@ class TTSManager:
             except Exception as e:
                 logger.warning(f"获取 {provider} 详细信息失败: {e}")
         
-        return info
+        self._provider_info_cache[cache_key] = info
+        return copy.deepcopy(info)
     
     def synthesize_text_stream(self,
                               provider: str,
@@ -371,10 +662,8 @@ class TTSManager:
 
     def get_all_providers_info(self) -> Dict[str, Dict[str, Any]]:
         """获取所有提供商信息"""
-        providers_info = {}
-        for provider in ['baidu', 'xunfei', 'douyin', 'aliyun', 'tencent']:
-            providers_info[provider] = self.get_provider_info(provider)
-        return providers_info
+        return {provider: self.get_provider_info(provider)
+                for provider in ('baidu', 'xunfei', 'douyin', 'aliyun', 'tencent')}
     
     def get_supported_voices_by_provider(self, provider: str) -> List[Dict[str, Any]]:
         """获取指定提供商支持的发音人列表"""
@@ -20,6 +20,9 @@ class TTSRequest:
     通用TTS请求参数类，适用于各TTS平台
     """
 
+    __slots__ = ('text', 'output_file', 'voice', 'speed', 'pitch', 'volume',
+                 'language', 'audio_format', 'sample_rate', 'extra')
+
     def __init__(self,
                  text: str,
                  output_file: str = None,
@@ -77,6 +80,9 @@ class TTSResponse:
     通用TTS响应类，封装文本转语音的结果
     """
 
+    __slots__ = ('text', 'audio_file', 'audio_data', 'success', 'error_msg', 'duration',
+                 'audio_length', 'file_size', 'timestamp', 'extra_info')
+
     def __init__(self,
                  text: str = "",
                  audio_file: str = "",
@@ -7,17 +7,173 @@ import tempfile
 import websocket
 import hashlib
 import base64
+import binascii
 import hmac
 import json
-from urllib.parse import urlencode
+from urllib.parse import quote_plus
 from datetime import datetime
 from time import mktime
 from wsgiref.handlers import format_date_time
+import re
 import ssl
-import _thread as thread
-from typing import Dict, Any, List
+import queue
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Tuple, Callable
+
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
+
 from .tts_base import BaseTTS
 from .tts_models import TTSRequest, TTSResponse
+from ._audio_cache import AudioCache, DEFAULT_CACHE_DIR
+from ._sentences import split_sentences
+
+# 每个 (host, path, api_key) 保留的空闲连接数
+WS_POOL_SIZE = 4
+# 空闲连接的最长保留时间（秒），超时后服务端可能已断开，不再复用
+WS_IDLE_TIMEOUT = 10
+
+# 发音人别名 -> 讯飞发音人ID
+_VOICE_MAP = MappingProxyType({
+    'female': 'x4_yezi',      # 叶子（女声）
+    'male': 'x4_lingfeng',    # 凌风（男声）
+    'xiaoyan': 'xiaoyan',     # 小燕（女声）
+    'xiaoyu': 'xiaoyu',       # 小宇（男声）
+})
+
+_SUPPORTED_VOICES = (
+    {'id': 'female', 'name': '叶子', 'gender': 'female', 'language': 'zh'},
+    {'id': 'male', 'name': '凌风', 'gender': 'male', 'language': 'zh'},
+    {'id': 'xiaoyan', 'name': '小燕', 'gender': 'female', 'language': 'zh'},
+    {'id': 'xiaoyu', 'name': '小宇', 'gender': 'male', 'language': 'zh'},
+)
+_SUPPORTED_FORMATS = ('wav', 'mp3')
+_SUPPORTED_LANGUAGES = ('zh', 'en')
+
+_ws_pools: Dict[Tuple[str, str, str], queue.Queue] = {}
+_ws_pools_lock = threading.Lock()
+
+# 时长估算：中文按每分钟300字计算
+CHARS_PER_MINUTE = 300
+
+# 句子级缓存：重复出现的句子直接复用已合成的PCM，只合成未缓存的句子
+SENTENCE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+SENTENCE_CACHE_MEMORY_ENTRIES = 256
+# 单次请求中并行合成未缓存句子的最大数量
+SENTENCE_CONCURRENCY = 3
+
+_AUF_RATE = re.compile(r'rate=(\d+)')
+
+# 16位单声道PCM的WAV文件头
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# 音频缓冲区池：缓冲区跨请求复用，避免每次合成重新分配数MB内存
+BUFFER_POOL_SIZE = 16
+BUFFER_POOL_MAX_BYTES = 4 * 1024 * 1024
+MIN_AUDIO_BUFFER = 64 * 1024
+_BUFFER_POOL: queue.LifoQueue = queue.LifoQueue(maxsize=BUFFER_POOL_SIZE)
+
+_sentence_cache: Optional[AudioCache] = None
+_sentence_cache_ready = False
+_sentence_cache_lock = threading.Lock()
+_sentence_executor = ThreadPoolExecutor(max_workers=SENTENCE_CONCURRENCY, thread_name_prefix='xunfei-sentence')
+
+
+def _rent_buffer() -> bytearray:
+    """从池中取出音频缓冲区，池为空时新建"""
+    try:
+        return _BUFFER_POOL.get_nowait()
+    except queue.Empty:
+        return bytearray(MIN_AUDIO_BUFFER)
+
+
+def _return_buffer(buf: bytearray) -> None:
+    """归还缓冲区，过大的缓冲区直接丢弃"""
+    if len(buf) <= BUFFER_POOL_MAX_BYTES:
+        try:
+            _BUFFER_POOL.put_nowait(buf)
+        except queue.Full:
+            pass
+
+
+class _SynthesisState:
+    """
+    单次合成的接收状态，每个请求独立持有，同一实例可被多个线程并发调用
+    音频写入池化的缓冲区，缓冲区长度即容量，有效数据为 audio_buf[offset:size]
+    """
+
+    __slots__ = ('audio_buf', 'offset', 'size', 'chunk_count', 'error_msg', 'complete',
+                 'stream_callback', 'session_id')
+
+    def __init__(self, audio_buf: bytearray, offset: int = 0,
+                 stream_callback: Callable = None, session_id: str = None):
+        self.audio_buf = audio_buf
+        self.offset = offset
+        self.size = offset
+        self.chunk_count = 0
+        self.error_msg = ""
+        self.complete = False
+        self.stream_callback = stream_callback
+        self.session_id = session_id
+
+    @property
+    def total_size(self) -> int:
+        """已接收的音频字节数"""
+        return self.size - self.offset
+
+    def append(self, data: bytes) -> None:
+        """追加一块音频数据，容量不足时按倍数扩容"""
+        buf = self.audio_buf
+        end = self.size + len(data)
+        if end > len(buf):
+            buf += bytes(max(len(buf), end - len(buf)))
+        buf[self.size:end] = data
+        self.size = end
+        self.chunk_count += 1
+
+
+def _json_bytes(obj: Any) -> bytes:
+    """序列化为UTF-8 JSON字节，优先使用orjson"""
+    if ORJSON_SUPPORT:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(data: Any) -> Any:
+    """解析JSON，优先使用orjson"""
+    if ORJSON_SUPPORT:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _get_sentence_cache() -> Optional[AudioCache]:
+    """获取进程内共享的句子级缓存，缓存目录不可用时返回None"""
+    global _sentence_cache, _sentence_cache_ready
+    with _sentence_cache_lock:
+        if not _sentence_cache_ready:
+            _sentence_cache_ready = True
+            cache_dir = os.path.join(os.getenv('TTS_CACHE_DIR', DEFAULT_CACHE_DIR), 'xunfei-sentences')
+            try:
+                _sentence_cache = AudioCache(cache_dir, SENTENCE_CACHE_MAX_BYTES,
+                                             max_memory_entries=SENTENCE_CACHE_MEMORY_ENTRIES)
+            except OSError:
+                _sentence_cache = None
+        return _sentence_cache
+
+
+def _get_ws_pool(key: Tuple[str, str, str]) -> queue.Queue:
+    """获取（必要时创建）指定服务端的空闲连接池，池在进程内跨实例共享"""
+    with _ws_pools_lock:
+        pool = _ws_pools.get(key)
+        if pool is None:
+            pool = _ws_pools[key] = queue.Queue(maxsize=WS_POOL_SIZE)
+        return pool
 
 
 class XunfeiTTS(BaseTTS):
@@ -43,37 +199,66 @@ class XunfeiTTS(BaseTTS):
         self.auf = self.config.get('auf', 'audio/L16;rate=16000')  # 音频文件编码
         self.aue = self.config.get('aue', 'raw')  # 音频编码
         self.tte = self.config.get('tte', 'utf8')  # 文本编码
+        self.timeout = self.config.get('timeout', 30)  # 连接/接收超时（秒）
+        rate = _AUF_RATE.search(self.auf)
+        self._sample_rate = int(rate.group(1)) if rate else 16000
+        # 句子级缓存（默认关闭）：逐句合成会改变句子之间的韵律衔接，需通过 sentence_cache=True 开启；
+        # 仅raw(PCM)输出可以逐句拼接。开启后由该缓存负责讯飞的结果缓存，TTS管理器不再重复缓存
+        self._sentence_cache = (_get_sentence_cache()
+                                if self.aue == 'raw' and self.config.get('sentence_cache', False) else None)
+        self.caches_results = self._sentence_cache is not None
+        
+        # 签名中不随请求变化的部分
+        self._api_secret_bytes = self.api_secret.encode('utf-8')
+        self._host_line = f"host: {self.host}\n".encode('utf-8')
+        self._request_line = f"\nGET {self.path} HTTP/1.1".encode('utf-8')
+        self._authorization_prefix = (f'api_key="{self.api_key}", algorithm="hmac-sha256", '
+                                      f'headers="host date request-line", signature=')
+        self._url_prefix = f'wss://{self.host}{self.path}?host={quote_plus(self.host)}'
+        
+        # 请求帧中不随请求变化的部分
+        self._common_frame = {"app_id": self.app_id}
+        self._business_base = {
+            "aue": self.aue,
+            "auf": self.auf,
+            "bgs": 1,  # 背景音乐
+            "tte": self.tte
+        }
+        
+        self._ws_pool = _get_ws_pool((self.host, self.path, self.api_key))
 
     def _create_url(self) -> str:
         """创建WebSocket连接URL"""
-        url = f'wss://{self.host}{self.path}'
-        now = datetime.now()
-        date = format_date_time(mktime(now.timetuple()))
-        
-        signature_origin = f"host: {self.host}\n"
-        signature_origin += f"date: {date}\n"
-        signature_origin += f"GET {self.path} HTTP/1.1"
+        date = format_date_time(mktime(datetime.now().timetuple()))
         
-        signature_sha = hmac.new(
-            self.api_secret.encode('utf-8'),
-            signature_origin.encode('utf-8'),
-            digestmod=hashlib.sha256
-        ).digest()
+        signature_origin = self._host_line + b"date: " + date.encode('utf-8') + self._request_line
+        signature_sha = hmac.new(self._api_secret_bytes, signature_origin, digestmod=hashlib.sha256).digest()
         signature_sha = base64.b64encode(signature_sha).decode(encoding='utf-8')
         
-        authorization_origin = f'api_key="{self.api_key}", algorithm="hmac-sha256", headers="host date request-line", signature="{signature_sha}"'
+        authorization_origin = f'{self._authorization_prefix}"{signature_sha}"'
         authorization = base64.b64encode(authorization_origin.encode('utf-8')).decode(encoding='utf-8')
         
-        v = {
-            "authorization": authorization,
-            "date": date,
-            "host": self.host
-        }
-        url = url + '?' + urlencode(v)
-        return url
+        return f'{self._url_prefix}&date={quote_plus(date)}&authorization={quote_plus(authorization)}'
 
     def synthesize(self, request: TTSRequest) -> TTSResponse:
         """执行文本转语音"""
+        return self._synthesize(request, save_file=True)
+
+    def synthesize_bytes(self, request: TTSRequest) -> Tuple[bytes, TTSResponse]:
+        """合成文本为内存中的音频数据，音频已在内存中拼接完成，无需落盘"""
+        response = self._synthesize(request, save_file=False)
+        return response.audio_data or b'', response
+
+    def _synthesize(self, request: TTSRequest, save_file: bool,
+                    stream_callback: Callable = None, session_id: str = None) -> TTSResponse:
+        """
+        执行合成
+        Args:
+            request: TTS请求参数
+            save_file: 是否将音频写入文件（未指定 output_file 时写入临时文件）
+            stream_callback: 流式回调函数，每收到一帧音频即回调
+            session_id: 会话ID
+        """
         start_time = time.time()
         
         try:
@@ -95,52 +280,63 @@ class XunfeiTTS(BaseTTS):
                     duration=time.time() - start_time
                 )
             
-            # 初始化结果存储
-            self._audio_data = b''
-            self._error_msg = ""
-            self._synthesis_complete = False
-            
-            # 创建WebSocket连接
-            ws_url = self._create_url()
-            ws = websocket.WebSocketApp(
-                ws_url,
-                on_message=self._on_message,
-                on_error=self._on_error,
-                on_close=self._on_close,
-                on_open=lambda ws: self._on_open(ws, request)
-            )
-            
-            # 运行WebSocket
-            ws.run_forever(sslopt={"cert_reqs": ssl.CERT_NONE})
-            
-            duration = time.time() - start_time
-            
-            if self._synthesis_complete and self._audio_data:
-                # 保存音频文件
-                audio_file = request.output_file
-                if not audio_file:
-                    temp_dir = tempfile.gettempdir()
-                    audio_file = os.path.join(temp_dir, f"tts_{int(time.time())}.wav")
+            # raw输出为无文件头的PCM，请求wav格式时在缓冲区开头预留WAV文件头
+            add_header = self.aue == 'raw' and (request.audio_format or 'wav').lower() == 'wav'
+            buf = _rent_buffer()
+            try:
+                state = _SynthesisState(buf, _WAV_HEADER.size if add_header else 0,
+                                        stream_callback, session_id)
+                if stream_callback is None and self._sentence_cache is not None:
+                    # 逐句查找缓存，只合成未缓存的句子
+                    self._synthesize_sentences(request, state)
+                else:
+                    # 从连接池取出连接发送请求，并阻塞接收直至合成完成
+                    self._run_synthesis(request, state)
+                
+                duration = time.time() - start_time
                 
-                with open(audio_file, 'wb') as f:
-                    f.write(self._audio_data)
+                if not state.complete or not state.total_size:
+                    return TTSResponse(
+                        text=request.text,
+                        success=False,
+                        error_msg=state.error_msg or "合成失败",
+                        duration=duration
+                    )
+                
+                if add_header:
+                    self._pack_wav_header(buf, state.total_size)
+                
+                audio_view = memoryview(buf)[:state.size]
+                try:
+                    # 保存音频文件，直接从缓冲区写出
+                    audio_file = ""
+                    if save_file:
+                        audio_file = request.output_file
+                        # 未指定输出文件时创建临时文件（mkstemp保证并发下文件名不冲突）
+                        if not audio_file:
+                            fd, audio_file = tempfile.mkstemp(prefix='tts_', suffix='.wav')
+                            os.close(fd)
+                        
+                        self._write_file(audio_file, audio_view)
+                    
+                    # 已写入文件且调用方不需要音频数据时（extra: return_bytes=False）不在结果中保留
+                    return_bytes = not save_file or request.extra.get('return_bytes', True)
+                    audio_data = bytes(audio_view) if return_bytes else None
+                finally:
+                    # 归还缓冲区前必须释放视图，否则缓冲区无法再扩容
+                    audio_view.release()
                 
                 return TTSResponse(
                     text=request.text,
                     audio_file=audio_file,
-                    audio_data=self._audio_data,
+                    audio_data=audio_data,
                     success=True,
                     duration=duration,
                     audio_length=self._estimate_audio_length(request.text),
-                    file_size=len(self._audio_data)
-                )
-            else:
-                return TTSResponse(
-                    text=request.text,
-                    success=False,
-                    error_msg=self._error_msg or "合成失败",
-                    duration=duration
+                    file_size=state.size
                 )
+            finally:
+                _return_buffer(buf)
                 
         except Exception as e:
             return TTSResponse(
@@ -150,66 +346,223 @@ class XunfeiTTS(BaseTTS):
                 duration=time.time() - start_time
             )
 
-    def _on_message(self, ws, message):
+    def _pack_wav_header(self, buf: bytearray, data_size: int) -> None:
+        """在缓冲区开头写入16位单声道PCM数据的WAV文件头"""
+        _WAV_HEADER.pack_into(buf, 0, b'RIFF', 36 + data_size, b'WAVE', b'fmt ', 16, 1, 1,
+                              self._sample_rate, self._sample_rate * 2, 2, 16, b'data', data_size)
+
+    @staticmethod
+    def _write_file(path: str, data) -> None:
+        """以无缓冲的 os.write 直接写出音频，通过 memoryview 切片处理短写入，不复制数据"""
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            with memoryview(data) as view:
+                offset = 0
+                while offset < len(view):
+                    offset += os.write(fd, view[offset:])
+        finally:
+            os.close(fd)
+
+    def _sentence_key(self, sentence: str, request: TTSRequest) -> str:
+        """句子级缓存键"""
+        raw = json.dumps([sentence, self._get_voice_id(request.voice), int(request.speed * 50),
+                          int(request.volume * 100), int(request.pitch * 50), self.auf, self.tte],
+                         ensure_ascii=False)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def _synthesize_sentence(self, sentence: str, request: TTSRequest) -> Tuple[bytes, str]:
+        """
+        合成单个句子
+        Returns:
+            Tuple[bytes, str]: (PCM数据, 错误信息)，成功时错误信息为空
+        """
+        sub_request = TTSRequest(text=sentence, voice=request.voice, speed=request.speed,
+                                 pitch=request.pitch, volume=request.volume,
+                                 language=request.language, audio_format=request.audio_format)
+        buf = _rent_buffer()
+        try:
+            state = _SynthesisState(buf)
+            self._run_synthesis(sub_request, state)
+            if state.complete and state.total_size:
+                with memoryview(buf) as view:
+                    return bytes(view[:state.size]), ""
+            return b'', state.error_msg or "合成失败"
+        finally:
+            _return_buffer(buf)
+
+    def _synthesize_sentences(self, request: TTSRequest, state: _SynthesisState) -> None:
+        """
+        逐句合成并将PCM依次写入 state：已缓存的句子直接复用，未缓存的句子并行合成后写入缓存
+        任一句合成失败时在 state 中记录错误
+        """
+        sentences = split_sentences(request.text)
+        keys = [self._sentence_key(sentence, request) for sentence in sentences]
+        parts = [self._sentence_cache.get_bytes(key) for key in keys]
+        
+        missing = [i for i, part in enumerate(parts) if part is None]
+        if len(missing) == 1:
+            results = [self._synthesize_sentence(sentences[missing[0]], request)]
+        else:
+            results = list(_sentence_executor.map(
+                lambda i: self._synthesize_sentence(sentences[i], request), missing))
+        
+        for i, (pcm, error_msg) in zip(missing, results):
+            if error_msg:
+                state.error_msg = error_msg
+                return
+            self._sentence_cache.put(keys[i], '.pcm', audio_data=pcm)
+            parts[i] = pcm
+        
+        for part in parts:
+            state.append(part)
+        state.complete = True
+
+    def _acquire_ws(self) -> Tuple[websocket.WebSocket, bool]:
+        """
+        取出一个空闲连接，没有可用连接时新建（每条新连接使用新签名的URL）
+        Returns:
+            Tuple: (连接, 是否为复用的连接)
+        """
+        while True:
+            try:
+                ws, last_used = self._ws_pool.get_nowait()
+            except queue.Empty:
+                break
+            if ws.connected and time.monotonic() - last_used < WS_IDLE_TIMEOUT:
+                return ws, True
+            self._close_ws(ws)
+        
+        return self._connect_ws(), False
+
+    def _connect_ws(self) -> websocket.WebSocket:
+        """新建连接（每条新连接使用新签名的URL）"""
+        return websocket.create_connection(
+            self._create_url(),
+            timeout=self.timeout,
+            sslopt={"cert_reqs": ssl.CERT_NONE}
+        )
+
+    def _release_ws(self, ws: websocket.WebSocket) -> None:
+        """归还仍然可用的连接，服务端已关闭或池已满时关闭连接"""
+        if ws.connected:
+            try:
+                self._ws_pool.put_nowait((ws, time.monotonic()))
+                return
+            except queue.Full:
+                pass
+        self._close_ws(ws)
+
+    @staticmethod
+    def _close_ws(ws: websocket.WebSocket) -> None:
+        try:
+            ws.close()
+        except Exception:
+            pass
+
+    def _run_synthesis(self, request: TTSRequest, state: _SynthesisState) -> None:
+        """
+        在池化连接上完成一次合成：发送请求帧后循环接收，直至合成完成或出错
+        复用的连接可能已被服务端关闭：仅当请求帧未能发送出去时才换一条新连接重发一次；
+        请求已发出后的失败不重试，避免同一合成被服务端重复处理计费
+        """
+        ws, reused = self._acquire_ws()
+        try:
+            self._on_open(ws, request)
+        except Exception as e:
+            self._close_ws(ws)
+            if not reused:
+                self._on_error(state, e)
+                return
+            try:
+                ws = self._connect_ws()
+            except Exception as e:
+                self._on_error(state, e)
+                return
+            try:
+                self._on_open(ws, request)
+            except Exception as e:
+                self._close_ws(ws)
+                self._on_error(state, e)
+                return
+        
+        try:
+            while not state.complete and not state.error_msg:
+                message = ws.recv()
+                if not message:
+                    raise websocket.WebSocketConnectionClosedException("连接已被服务端关闭")
+                self._on_message(state, message)
+        except Exception as e:
+            self._close_ws(ws)
+            self._on_error(state, e)
+            return
+        
+        if state.error_msg:
+            self._close_ws(ws)
+        else:
+            self._release_ws(ws)
+
+    def _on_message(self, state: _SynthesisState, message):
         """WebSocket消息处理"""
         try:
-            data = json.loads(message)
+            data = _json_loads(message)
             code = data['code']
             
             if code != 0:
-                self._error_msg = data.get('message', f'错误码: {code}')
-                ws.close()
+                state.error_msg = data.get('message', f'错误码: {code}')
                 return
             
             audio_data = data.get('data', {}).get('audio')
+            status = data.get('data', {}).get('status', 0)
             if audio_data:
-                audio_bytes = base64.b64decode(audio_data)
-                self._audio_data += audio_bytes
+                state.append(binascii.a2b_base64(audio_data))
+                
+                # 流式回调：服务端下发的即为base64音频，直接转发，无需重新编码
+                if state.stream_callback and state.session_id:
+                    state.stream_callback(
+                        state.session_id, 'tts_stream',
+                        audio_data,
+                        chunk_count=state.chunk_count,
+                        total_size=state.total_size,
+                        is_final=(status == 2)
+                    )
             
-            status = data.get('data', {}).get('status', 0)
             if status == 2:  # 合成完成
-                self._synthesis_complete = True
-                ws.close()
+                state.complete = True
+                if state.stream_callback and state.session_id:
+                    state.stream_callback(
+                        state.session_id, 'tts_stream_complete',
+                        f"TTS合成完成，共{state.chunk_count}块音频数据",
+                        chunk_count=state.chunk_count,
+                        total_size=state.total_size,
+                        is_final=True
+                    )
                 
         except Exception as e:
-            self._error_msg = f"处理消息失败: {str(e)}"
-            ws.close()
+            state.error_msg = f"处理消息失败: {str(e)}"
 
-    def _on_error(self, ws, error):
+    def _on_error(self, state: _SynthesisState, error):
         """WebSocket错误处理"""
-        self._error_msg = f"WebSocket错误: {str(error)}"
-
-    def _on_close(self, ws, close_status_code, close_msg):
-        """WebSocket关闭处理"""
-        pass
+        state.error_msg = f"WebSocket错误: {str(error)}"
 
     def _on_open(self, ws, request: TTSRequest):
-        """WebSocket连接打开处理"""
-        def run():
-            # 构建请求数据
-            data = {
-                "common": {
-                    "app_id": self.app_id,
-                },
-                "business": {
-                    "aue": self.aue,
-                    "auf": self.auf,
-                    "vcn": self._get_voice_id(request.voice),
-                    "speed": int(request.speed * 50),  # 语速，取值范围[0, 100]
-                    "volume": int(request.volume * 100),  # 音量，取值范围[0, 100]
-                    "pitch": int(request.pitch * 50),  # 音调，取值范围[0, 100]
-                    "bgs": 1,  # 背景音乐
-                    "tte": self.tte
-                },
-                "data": {
-                    "status": 2,
-                    "text": base64.b64encode(request.text.encode('utf-8')).decode('utf-8')
-                }
+        """发送合成请求帧"""
+        data = {
+            "common": self._common_frame,
+            "business": {
+                **self._business_base,
+                "vcn": self._get_voice_id(request.voice),
+                "speed": int(request.speed * 50),  # 语速，取值范围[0, 100]
+                "volume": int(request.volume * 100),  # 音量，取值范围[0, 100]
+                "pitch": int(request.pitch * 50),  # 音调，取值范围[0, 100]
+            },
+            "data": {
+                "status": 2,
+                "text": base64.b64encode(request.text.encode('utf-8')).decode('utf-8')
             }
-            
-            ws.send(json.dumps(data))
-            
-        thread.start_new_thread(run, ())
+        }
+        
+        # websocket-client 以文本帧发送时接受UTF-8字节，无需先解码为str
+        ws.send(_json_bytes(data))
 
     def synthesize_text(self, 
                        text: str,
@@ -233,35 +586,59 @@ class XunfeiTTS(BaseTTS):
         )
         return self.synthesize(request)
 
+    def synthesize_text_stream(self,
+                              text: str,
+                              voice: str = None,
+                              speed: float = 1.0,
+                              pitch: float = 1.0,
+                              volume: float = 1.0,
+                              language: str = 'zh',
+                              audio_format: str = 'wav',
+                              stream_callback: Callable = None,
+                              session_id: str = None) -> TTSResponse:
+        """
+        流式合成文本为语音，每收到一帧音频即通过 stream_callback 推送，无需等待合成结束
+        Args:
+            text: 要合成的文本
+            voice: 发音人
+            speed: 语速
+            pitch: 音调
+            volume: 音量
+            language: 语言
+            audio_format: 音频格式
+            stream_callback: 流式回调函数
+            session_id: 会话ID
+        Returns:
+            TTSResponse: 合成结果
+        """
+        request = TTSRequest(
+            text=text,
+            voice=voice,
+            speed=speed,
+            pitch=pitch,
+            volume=volume,
+            language=language,
+            audio_format=audio_format
+        )
+        return self._synthesize(request, save_file=False,
+                                stream_callback=stream_callback, session_id=session_id)
+
     def _get_voice_id(self, voice: str) -> str:
         """获取发音人ID"""
-        voice_map = {
-            'female': 'x4_yezi',      # 叶子（女声）
-            'male': 'x4_lingfeng',    # 凌风（男声）
-            'xiaoyan': 'xiaoyan',     # 小燕（女声）
-            'xiaoyu': 'xiaoyu',       # 小宇（男声）
-        }
-        return voice_map.get(voice, 'x4_yezi')  # 默认叶子
+        return _VOICE_MAP.get(voice, 'x4_yezi')  # 默认叶子
     
     def get_supported_voices(self) -> List[Dict[str, Any]]:
         """获取支持的发音人列表"""
-        return [
-            {'id': 'female', 'name': '叶子', 'gender': 'female', 'language': 'zh'},
-            {'id': 'male', 'name': '凌风', 'gender': 'male', 'language': 'zh'},
-            {'id': 'xiaoyan', 'name': '小燕', 'gender': 'female', 'language': 'zh'},
-            {'id': 'xiaoyu', 'name': '小宇', 'gender': 'male', 'language': 'zh'},
-        ]
+        return [dict(voice) for voice in _SUPPORTED_VOICES]
     
     def get_supported_formats(self) -> List[str]:
         """获取支持的音频格式"""
-        return ['wav', 'mp3']
+        return list(_SUPPORTED_FORMATS)
     
     def get_supported_languages(self) -> List[str]:
         """获取支持的语言"""
-        return ['zh', 'en']
+        return list(_SUPPORTED_LANGUAGES)
     
     def _estimate_audio_length(self, text: str) -> float:
         """估算音频时长（秒）"""
-        # 简单估算：中文按每分钟300字计算
-        chars_per_minute = 300
-        return len(text) / chars_per_minute * 60
+        return len(text) * 60 / CHARS_PER_MINUTE
@@ -1,12 +1,47 @@
 #!/usr/bin/env python3
 """
 快速启动脚本
+开发时可通过 YUSHU_RELOAD=1 python start.py 启用代码热重载；
+YUSHU_WORKERS=<进程数|auto> 可在Linux上以多个工作进程运行
+
+多进程模式的限制（默认单进程即因为以下状态只保存在各自进程中）：
+- 配置中心等服务的状态保存在进程内存中，在一个进程中的修改对其他进程不可见；
+- TTS临时音频（/api/tts/download/{key}）记录在 tts_manager._temp_audio_cache 中，
+  下载请求被分配到其他进程时返回404；
+- TTS合成缓存的 index.json 与幻灯片的 manifest.json 由各进程分别写出，互相覆盖，
+  以最后写出的进程为准（缓存音频文件本身不受影响）。
 """
 
-import subprocess
 import sys
 import os
-from pathlib import Path
+import threading
+import importlib
+from importlib.util import find_spec
+
+SERVER_HOST = "0.0.0.0"
+SERVER_PORT = 8000
+
+# 启动横幅，预先拼接为单个字符串，一次写出
+LAUNCHER_BANNER = "\n".join([
+    "=" * 50,
+    "🤖 YushuRobot 微服务启动器",
+    "=" * 50,
+]) + "\n"
+SERVER_BANNER = "\n".join([
+    "🚀 启动YushuRobot微服务...",
+    "🌐 前端页面: http://localhost:8000",
+    "📄 API文档: http://localhost:8000/docs",
+    "🔧 API信息: http://localhost:8000/api",
+    "💚 健康检查: http://localhost:8000/health",
+    "⏹️  按 Ctrl+C 停止服务",
+    "-" * 50,
+]) + "\n"
+
+
+def _print_banner(text):
+    """仅在交互终端中输出横幅，日志采集/CI等非终端场景跳过"""
+    if sys.stdout.isatty():
+        sys.stdout.write(text)
 
 
 def check_python_version():
@@ -19,37 +54,157 @@ def check_python_version():
 
 
 def check_dependencies():
-    """检查依赖是否安装"""
-    try:
-        import fastapi
-        import uvicorn
-        print("✅ 依赖检查通过")
-        return True
-    except ImportError as e:
-        print(f"❌ 缺少依赖: {e}")
+    """检查依赖是否安装（只查找模块，不执行模块代码）"""
+    missing = [name for name in ("fastapi", "uvicorn") if find_spec(name) is None]
+    if missing:
+        print(f"❌ 缺少依赖: {', '.join(missing)}")
         print("请运行: pip install -r requirements.txt")
         return False
+    print("✅ 依赖检查通过")
+    return True
+
+
+def _reload_enabled():
+    """是否启用热重载（YUSHU_RELOAD=1）"""
+    return os.environ.get("YUSHU_RELOAD") == "1"
+
+
+def _warm_app_imports():
+    """在后台线程中预先导入应用模块，uvicorn加载 main:app 时直接命中 sys.modules"""
+    try:
+        importlib.import_module("main")
+    except Exception:
+        # 导入失败由uvicorn加载应用时报告
+        pass
+
+
+def _worker_count():
+    """工作进程数（YUSHU_WORKERS），auto 表示按可用CPU核数，默认单进程"""
+    value = os.environ.get("YUSHU_WORKERS", "1").strip().lower()
+    if value == "auto":
+        return len(_available_cpus())
+    try:
+        return max(1, int(value))
+    except ValueError:
+        return 1
+
+
+def _available_cpus():
+    """当前进程允许使用的CPU列表（遵循容器的cpuset限制）"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _multiprocess_supported():
+    """多进程模式依赖 fork 与 SO_REUSEPORT（Linux），热重载时不适用"""
+    import socket
+
+    return not _reload_enabled() and hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")
+
+
+def _server_options():
+    """uvicorn 配置参数"""
+    # 安装了uvloop/httptools（uvicorn[standard]自带）时使用它们替代asyncio事件循环与h11解析器
+    return {
+        "loop": "uvloop" if find_spec("uvloop") else "auto",
+        "http": "httptools" if find_spec("httptools") else "auto",
+        "access_log": False,
+    }
+
+
+def _reuseport_socket():
+    """创建开启 SO_REUSEPORT 的监听套接字，由内核在各工作进程间分配连接"""
+    import socket
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((SERVER_HOST, SERVER_PORT))
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(cpu):
+    """工作进程：绑定到指定CPU核并在独立的 SO_REUSEPORT 套接字上运行uvicorn"""
+    import uvicorn
+
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+    config = uvicorn.Config("main:app", host=SERVER_HOST, port=SERVER_PORT, **_server_options())
+    uvicorn.Server(config).run(sockets=[_reuseport_socket()])
+
+
+def _run_workers(count):
+    """
+    预导入应用后 fork 出多个工作进程，应用模块以写时复制方式共享；
+    主进程只负责转发终止信号并等待工作进程退出
+    """
+    import signal
+
+    cpus = _available_cpus()
+    pids = []
+    # 避免缓冲区中的启动信息在每个子进程中重复输出
+    sys.stdout.flush()
+    for i in range(count):
+        # 工作进程数不超过核数时逐个绑核，否则交给内核调度
+        cpu = cpus[i] if count <= len(cpus) else None
+        pid = os.fork()
+        if pid == 0:
+            code = 0
+            try:
+                _run_worker(cpu)
+            except KeyboardInterrupt:
+                pass
+            except Exception as e:
+                print(f"❌ 工作进程启动失败: {e}")
+                code = 1
+            finally:
+                os._exit(code)
+        pids.append(pid)
+
+    def forward(signum, frame):
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, forward)
+    remaining = set(pids)
+    while remaining:
+        try:
+            pid, _ = os.wait()
+        except KeyboardInterrupt:
+            # Ctrl+C 已发送给整个前台进程组，继续等待工作进程退出
+            continue
+        except ChildProcessError:
+            break
+        remaining.discard(pid)
 
 
 def start_server():
     """启动服务器"""
-    print("🚀 启动YushuRobot微服务...")
-    print("🌐 前端页面: http://localhost:8000")
-    print("📄 API文档: http://localhost:8000/docs")
-    print("🔧 API信息: http://localhost:8000/api")
-    print("💚 健康检查: http://localhost:8000/health")
-    print("⏹️  按 Ctrl+C 停止服务")
-    print("-" * 50)
+    _print_banner(SERVER_BANNER)
 
     try:
-        # 使用uvicorn启动
-        subprocess.run([
-            sys.executable, "-m", "uvicorn",
-            "main:app",
-            "--host", "0.0.0.0",
-            "--port", "8000",
-            "--reload"
-        ])
+        workers = _worker_count()
+        if workers > 1 and _multiprocess_supported():
+            print(f"👥 工作进程数: {workers}")
+            _run_workers(workers)
+            print("\n🛑 服务已停止")
+        else:
+            import uvicorn
+
+            # 在当前进程内启动uvicorn，不再额外启动一个Python解释器
+            uvicorn.run(
+                "main:app",
+                host=SERVER_HOST,
+                port=SERVER_PORT,
+                # 热重载会额外启动监视进程并在子进程中重复导入应用，仅在开发时按需开启
+                reload=_reload_enabled(),
+                **_server_options()
+            )
     except KeyboardInterrupt:
         print("\n🛑 服务已停止")
     except Exception as e:
@@ -58,9 +213,13 @@ def start_server():
 
 def main():
     """主函数"""
-    print("=" * 50)
-    print("🤖 YushuRobot 微服务启动器")
-    print("=" * 50)
+    # 热重载模式下应用在子进程中导入，预热当前进程没有意义
+    warmer = None
+    if not _reload_enabled():
+        warmer = threading.Thread(target=_warm_app_imports, name="yushu-warm-imports", daemon=True)
+        warmer.start()
+
+    _print_banner(LAUNCHER_BANNER)
 
     # 检查Python版本
     check_python_version()
@@ -69,7 +228,9 @@ def main():
     if not check_dependencies():
         return
 
-    # 启动服务器
+    # 等待应用模块预导入完成后再启动服务器
+    if warmer is not None:
+        warmer.join()
     start_server()
 
 